@@ -1,17 +1,31 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
+from flask_migrate import Migrate
+import click
+from sqlalchemy import text
 from config import Config
-from models import db, User, Feedback
+from models import db, User, Feedback, FeedbackStats, FeedbackComment
+from notifications import run_dispatcher
+from identity import invalidate_user
+from tokens import jwt
+from instrumentation import init_instrumentation
+from health import readiness
+from json_provider import init_json
 import logging
+import os
+
+migrate = Migrate()
 
 # Import route blueprints
 from routes.auth import auth_bp
 from routes.feedback import feedback_bp
 from routes.users import users_bp
+from routes.events import events_bp
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    init_json(app)
     
     # Set up logging
     logging.basicConfig(level=app.config.get('LOG_LEVEL', 'INFO'))
@@ -19,40 +33,64 @@ def create_app():
     
     # Initialize extensions
     db.init_app(app)
+    jwt.init_app(app)
+    migrate.init_app(
+        app, db,
+        directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'),
+        render_as_batch=True  # batch mode so ALTERs also work on SQLite
+    )
     CORS(app)
     
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(feedback_bp, url_prefix='/api/feedback')
     app.register_blueprint(users_bp, url_prefix='/api/users')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+    
+    # Opt-in request profiling, Server-Timing headers and /metrics
+    init_instrumentation(app)
+    
+    # Schema is managed by migrations (flask db upgrade) and demo data by
+    # `flask seed`; worker startup performs no database writes.
+    @app.cli.command('seed')
+    def seed_command():
+        """Insert the demo users and sample feedback (safe to run repeatedly)"""
+        create_sample_data()
     
-    # Create tables and sample data with error handling
-    with app.app_context():
-        try:
-            logger.info("Attempting to create database tables...")
-            db.create_all()
-            create_sample_data()
-            logger.info("Database initialization completed successfully!")
-        except Exception as e:
-            logger.error(f"Database initialization failed: {e}")
-            # Don't fail the entire app startup - let it run without DB for now
-            pass
+    @app.cli.command('dispatch-notifications')
+    @click.option('--once', is_flag=True, help='Exit once no notifications are due')
+    def dispatch_notifications_command(once):
+        """Run the email outbox dispatcher worker"""
+        run_dispatcher(once=once)
+    
+    @app.cli.command('reconcile-counters')
+    def reconcile_counters_command():
+        """Repair drift in the maintained comment, like and feedback counters"""
+        if db.engine.dialect.name == 'postgresql':
+            # Hold off writers (readers carry on) so the recount matches what gets written
+            db.session.execute(text('LOCK TABLE feedback, feedback_comments, comment_likes IN SHARE MODE'))
+        comments = Feedback.reconcile_comments_count()
+        likes = FeedbackComment.reconcile_likes()
+        totals = FeedbackStats.reconcile()
+        db.session.commit()
+        click.echo(f'Repaired {comments} comment counts, {likes} like counts and {totals} feedback totals')
     
+    # Liveness: the process answers; never touches the database, so a database
+    # outage doesn't get every container restarted
     @app.route('/')
+    @app.route('/health/live')
     def health_check():
-        try:
-            # Test database connection
-            db.session.execute(db.text('SELECT 1'))
-            db_status = "connected"
-        except Exception as e:
-            db_status = f"disconnected: {str(e)}"
-        
         return jsonify({
             "message": "Feedback System API is running!",
-            "status": "healthy",
-            "database": db_status
+            "status": "healthy"
         })
     
+    # Readiness: database reachable (cached check) plus connection pool stats
+    @app.route('/health/ready')
+    def readiness_check():
+        ready, body = readiness()
+        return jsonify(body), 200 if ready else 503
+    
     @app.errorhandler(404)
     def not_found(error):
         return jsonify({'error': 'Endpoint not found'}), 404
@@ -63,71 +101,75 @@ def create_app():
     
     return app
 
+DEMO_PASSWORD = 'password123'
+
 def create_sample_data():
-    """Create sample users and feedback data matching hardcoded authentication"""
+    """Create sample users (password: password123) and feedback data.
+    Idempotent: existing users are matched by email and nothing is deleted."""
     
     try:
-        # Clear existing data
-        db.session.query(Feedback).delete()
-        db.session.query(User).delete()
-        
-        # Create hardcoded users to match frontend authentication
+        # Demo users matching the frontend's login screen
         users_data = [
             {
-                "id": 1,
                 "name": "John Manager",
                 "email": "manager1@company.com",
                 "role": "manager",
-                "manager_id": None
+                "manager_email": None
             },
             {
-                "id": 2,
                 "name": "Jane Employee",
                 "email": "employee1@company.com",
                 "role": "employee",
-                "manager_id": 1
+                "manager_email": "manager1@company.com"
             },
             {
-                "id": 3,
                 "name": "Bob Employee", 
                 "email": "employee2@company.com",
                 "role": "employee",
-                "manager_id": 1
+                "manager_email": "manager1@company.com"
             }
         ]
         
+        users = {}
         for user_data in users_data:
-            existing_user = User.query.filter_by(email=user_data["email"]).first()
-            if not existing_user:
+            user = User.query.filter_by(email=user_data["email"]).first()
+            if not user:
                 user = User(
                     name=user_data["name"],
                     email=user_data["email"],
-                    role=user_data["role"],
-                    manager_id=user_data["manager_id"]
+                    role=user_data["role"]
                 )
                 db.session.add(user)
+            if not user.password_hash:
+                user.set_password(DEMO_PASSWORD)
+            manager = users.get(user_data["manager_email"])
+            if manager:
+                user.manager = manager
+            users[user_data["email"]] = user
+        db.session.flush()
+        
+        manager = users["manager1@company.com"]
+        jane = users["employee1@company.com"]
+        bob = users["employee2@company.com"]
         
         # Create sample feedback
         feedback_data = [
             {
-                "manager_id": 1,
-                "employee_id": 2,
+                "employee": jane,
                 "strengths": "Excellent problem-solving skills and great team collaboration. Shows initiative in taking on challenging tasks.",
                 "areas_to_improve": "Could improve time management and deadline adherence. Consider using project management tools.",
                 "sentiment": "positive",
                 "acknowledged": False
             },
             {
-                "manager_id": 1,
-                "employee_id": 3,
+                "employee": bob,
                 "strengths": "Strong technical skills and attention to detail. Very reliable and consistent performer.",
                 "areas_to_improve": "Would benefit from more proactive communication with team members and stakeholders.",
                 "sentiment": "positive", 
                 "acknowledged": True
             },
             {
-                "manager_id": 1,
-                "employee_id": 2,
+                "employee": jane,
                 "strengths": "Great improvement in communication skills over the past quarter. Very responsive to feedback.",
                 "areas_to_improve": "Continue working on presentation skills for client meetings.",
                 "sentiment": "positive",
@@ -136,17 +178,26 @@ def create_sample_data():
         ]
         
         for feedback_item in feedback_data:
+            exists = Feedback.query.filter_by(
+                manager_id=manager.id,
+                employee_id=feedback_item["employee"].id,
+                strengths=feedback_item["strengths"]
+            ).first()
+            if exists:
+                continue
             feedback = Feedback(
-                manager_id=feedback_item["manager_id"],
-                employee_id=feedback_item["employee_id"],
+                manager_id=manager.id,
+                employee_id=feedback_item["employee"].id,
                 strengths=feedback_item["strengths"],
                 areas_to_improve=feedback_item["areas_to_improve"],
                 sentiment=feedback_item["sentiment"],
                 acknowledged=feedback_item["acknowledged"]
             )
             db.session.add(feedback)
+            FeedbackStats.adjust(added=[feedback.counted_state()])
         
         db.session.commit()
+        invalidate_user()
         print("Sample data created successfully!")
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,69 @@
+"""
+Serialization cost of large listings with each JSON provider.
+
+Encodes a 1000-row feedback listing payload directly, then times the
+listing (limit=200) and a deep comment tree through the full request path,
+once per provider (stdlib, and orjson when installed).
+
+    cd backend && python benchmarks/bench_json.py [--iterations 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-of-at-least-32-bytes')
+
+from flask_migrate import upgrade
+from app import create_app
+from models import Feedback
+from identity import get_user
+from tokens import issue_access_token
+from json_provider import JSON_PROVIDERS, orjson
+from benchmarks.seed import SCALES, seed, is_seeded, fixtures
+
+def per_call_ms(fn, iterations):
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+    
+    app = create_app()
+    with app.app_context():
+        upgrade()
+        if not is_seeded():
+            seed(SCALES['1k'])
+        fx = fixtures()
+        headers = {'Authorization': f"Bearer {issue_access_token(get_user(fx['manager_id']))}"}
+        rows = Feedback.query.with_entities(*Feedback.list_columns()).filter_by(
+            manager_id=fx['manager_id']
+        ).limit(1000).all()
+        payload = {'feedback': Feedback.to_dict_list(rows)}
+    
+    client = app.test_client()
+    requests = {
+        'listing (200 rows)': '/api/feedback/?limit=200',
+        'deep comment tree': f"/api/feedback/{fx['deep_feedback_id']}/comments"
+    }
+    
+    for name in ['stdlib'] + (['orjson'] if orjson is not None else []):
+        app.json = JSON_PROVIDERS[name](app)
+        with app.app_context():
+            encode = per_call_ms(lambda: app.json.dumps(payload), args.iterations)
+        print(f"{name}:")
+        print(f"  encode 1000-row listing payload  {encode:8.2f} ms")
+        for label, url in requests.items():
+            elapsed = per_call_ms(lambda: client.get(url, headers=headers), args.iterations)
+            print(f"  GET {label:28s} {elapsed:8.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Login throughput for the configured password hash parameters.
+
+Runs POST /api/auth/login through the test client, sequentially and from
+several client threads at once, and reports logins per second per core.
+
+    cd backend && python benchmarks/bench_login.py [--logins 50] [--threads N] [--method scrypt]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-of-at-least-32-bytes')
+
+from flask_migrate import upgrade
+from app import create_app, create_sample_data, DEMO_PASSWORD
+from models import db, User
+
+CREDENTIALS = {'email': 'manager1@company.com', 'password': DEMO_PASSWORD}
+
+def run_logins(app, logins, threads):
+    def login(_):
+        response = app.test_client().post('/api/auth/login', json=CREDENTIALS)
+        assert response.status_code == 200, response.get_json()
+    
+    started = time.perf_counter()
+    if threads == 1:
+        for i in range(logins):
+            login(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(login, range(logins)))
+    return logins / (time.perf_counter() - started)
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--logins', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=cores)
+    parser.add_argument('--method', help='PASSWORD_HASH_METHOD to benchmark (default: configured)')
+    args = parser.parse_args()
+    
+    app = create_app()
+    if args.method:
+        app.config['PASSWORD_HASH_METHOD'] = args.method
+    
+    with app.app_context():
+        upgrade()
+        create_sample_data()
+        # Hash the demo password with the benchmarked parameters up front
+        user = User.query.filter_by(email=CREDENTIALS['email']).first()
+        user.set_password(DEMO_PASSWORD)
+        db.session.commit()
+    
+    sequential = run_logins(app, args.logins, 1)
+    concurrent = run_logins(app, args.logins, args.threads)
+    used_cores = min(args.threads, app.config['PASSWORD_HASH_WORKERS'], cores)
+    
+    print(f"method: {app.config['PASSWORD_HASH_METHOD']}  cores: {cores}  hash workers: {app.config['PASSWORD_HASH_WORKERS']}")
+    print(f"sequential:            {sequential:8.1f} logins/s")
+    print(f"{args.threads:2d} client threads:     {concurrent:8.1f} logins/s  ({concurrent / used_cores:.1f} per core)")
+
+if __name__ == '__main__':
+    main()
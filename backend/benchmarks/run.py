@@ -0,0 +1,259 @@
+"""
+Load-test harness for the API: seeds synthetic data at a given scale, drives
+the hot routes in-process (Flask test client) or over gunicorn (HTTP), and
+reports p50/p95/p99 latency, throughput and peak RSS per scenario. When a
+stored baseline exists for the same database/scale/mode, the run fails if a
+scenario's p95 or throughput regresses past the tolerance.
+
+    cd backend
+    python benchmarks/run.py --scale 1k
+    python benchmarks/run.py --scale 100k --mode gunicorn --concurrency 8
+    python benchmarks/run.py --scale 1m --database-url postgresql://localhost/feedback_bench
+    python benchmarks/run.py --scale 1k --save-baseline
+"""
+import argparse
+import http.client
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from alembic.script import ScriptDirectory
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'baselines')
+JWT_SECRET = 'benchmark-secret-key-of-at-least-32-bytes'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', choices=['1k', '100k', '1m'], default='1k')
+    parser.add_argument('--database-url', help='default: a cached SQLite file per scale and schema in the temp dir')
+    parser.add_argument('--mode', choices=['inprocess', 'gunicorn'], default='inprocess')
+    parser.add_argument('--requests', type=int, default=200, help='measured requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+    parser.add_argument('--scenario', action='append', help='run only these scenarios')
+    parser.add_argument('--baseline', help='baseline JSON (default: baselines/<db>-<scale>-<mode>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='allowed regression, 0.3 = 30%%')
+    parser.add_argument('--output', help='also write the results JSON here')
+    return parser.parse_args()
+
+def cached_database_url(scale):
+    """
+    SQLite file reused across runs of one scale. Named after the migration head,
+    so a file seeded under an older schema is never picked up again.
+    """
+    head = ScriptDirectory(os.path.join(BACKEND_DIR, 'migrations')).get_current_head()
+    return f"sqlite:///{os.path.join(tempfile.gettempdir(), f'feedback-bench-{scale}-{head}.db')}"
+
+args = parse_args()
+database_url = args.database_url or cached_database_url(args.scale)
+os.environ['DATABASE_URL'] = database_url
+os.environ['JWT_SECRET_KEY'] = JWT_SECRET
+sys.path.insert(0, BACKEND_DIR)
+
+from flask_migrate import upgrade
+from app import create_app
+from models import db
+from identity import get_user
+from tokens import issue_access_token
+from benchmarks.seed import SCALES, seed, is_seeded, fixtures
+
+def scenarios(fx, tokens):
+    """name -> (method, path for the i-th request, bearer token)"""
+    feedback_ids = fx['feedback_ids']
+    comment_ids = fx['comment_ids']
+    deep = fx['deep_feedback_id']
+    return {
+        'list': ('GET', lambda i: '/api/feedback/?limit=50', tokens['manager']),
+        'dashboard_manager': ('GET', lambda i: '/api/feedback/dashboard', tokens['manager']),
+        'dashboard_employee': ('GET', lambda i: '/api/feedback/dashboard', tokens['employee']),
+        'comment_tree': ('GET', lambda i: f'/api/feedback/{deep}/comments', tokens['manager']),
+        'like_toggle': ('POST', lambda i: f'/api/feedback/{deep}/comments/{comment_ids[i % len(comment_ids)]}/like',
+                        tokens['manager']),
+        'pdf_export': ('GET', lambda i: f'/api/feedback/{feedback_ids[i % len(feedback_ids)]}/export-pdf',
+                       tokens['manager']),
+    }
+
+class InProcessClient:
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+    
+    def request(self, method, path, token):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, headers={'Authorization': f'Bearer {token}'})
+        response.close()
+        return response.status_code
+
+class HttpClient:
+    def __init__(self, port):
+        self.port = port
+        self._local = threading.local()
+    
+    def request(self, method, path, token):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+        try:
+            connection.request(method, path, headers={'Authorization': f'Bearer {token}'})
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (http.client.HTTPException, OSError):
+            self._local.connection = None
+            connection.close()
+            return 599
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def run_scenario(client, method, path_for, token, requests, concurrency):
+    for i in range(min(10, requests)):
+        client.request(method, path_for(i), token)
+    
+    def timed(i):
+        started = time.perf_counter()
+        status = client.request(method, path_for(i), token)
+        return time.perf_counter() - started, status
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - started
+    
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'throughput_rps': round(requests / elapsed, 1),
+        'errors': sum(1 for _, status in results if status >= 400)
+    }
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_gunicorn(workers):
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+        '--worker-class', 'gthread', '--threads', '8', '--log-level', 'warning', 'app:create_app()'
+    ], cwd=BACKEND_DIR, env=os.environ.copy())
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/')
+            connection.getresponse().read()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start within 30s')
+
+def compare(results, baseline, tolerance):
+    """Regression messages for scenarios slower or less productive than the baseline allows"""
+    regressions = []
+    for name, base in baseline['scenarios'].items():
+        current = results['scenarios'].get(name)
+        if current is None:
+            continue
+        if current['errors']:
+            regressions.append(f"{name}: {current['errors']} failed requests")
+        if current['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if current['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{name}: {current['throughput_rps']} req/s vs baseline {base['throughput_rps']} req/s")
+    return regressions
+
+def main():
+    app = create_app()
+    with app.app_context():
+        upgrade()
+        if not is_seeded():
+            print(f"Seeding {args.scale} feedback rows into {db.engine.url.render_as_string()} ...")
+            started = time.perf_counter()
+            seed(SCALES[args.scale])
+            print(f"Seeded in {time.perf_counter() - started:.1f}s")
+        fx = fixtures()
+        tokens = {
+            'manager': issue_access_token(get_user(fx['manager_id'])),
+            'employee': issue_access_token(get_user(fx['employee_id']))
+        }
+        dialect = db.engine.dialect.name
+    
+    gunicorn = None
+    if args.mode == 'gunicorn':
+        gunicorn, port = start_gunicorn(args.workers)
+        client = HttpClient(port)
+    else:
+        client = InProcessClient(app)
+    
+    results = {
+        'database': dialect,
+        'scale': args.scale,
+        'mode': args.mode,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'scenarios': {}
+    }
+    try:
+        for name, (method, path_for, token) in scenarios(fx, tokens).items():
+            if args.scenario and name not in args.scenario:
+                continue
+            results['scenarios'][name] = stats = run_scenario(
+                client, method, path_for, token, args.requests, args.concurrency
+            )
+            print(f"{name:20s} p50 {stats['p50_ms']:8.2f}ms  p95 {stats['p95_ms']:8.2f}ms  "
+                  f"p99 {stats['p99_ms']:8.2f}ms  {stats['throughput_rps']:8.1f} req/s  errors {stats['errors']}")
+    finally:
+        if gunicorn is not None:
+            gunicorn.terminate()
+            gunicorn.wait()
+    
+    # ru_maxrss is in KiB on Linux; for gunicorn it covers the reaped server processes
+    who = resource.RUSAGE_CHILDREN if gunicorn is not None else resource.RUSAGE_SELF
+    results['peak_rss_mb'] = round(resource.getrusage(who).ru_maxrss / 1024, 1)
+    print(f"peak RSS: {results['peak_rss_mb']} MB")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{dialect}-{args.scale}-{args.mode}.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+    
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+    
+    with open(baseline_path) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions:
+        print(f"Regressions against {baseline_path}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"No regressions against {baseline_path} (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
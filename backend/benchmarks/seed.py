@@ -0,0 +1,133 @@
+"""
+Synthetic data for benchmarks: managers with teams of employees, feedback
+rows spread evenly across them, tags, and comment threads including a few
+very deep ones. Inserts go through Core executemany in batches, so 1M rows
+load in minutes rather than hours.
+"""
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, text
+from models import db, User, Feedback, FeedbackStats, FeedbackComment, Tag, feedback_tags
+
+SCALES = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000
+}
+
+TEAM_SIZE = 10
+FEEDBACK_PER_MANAGER = 1_000
+DEEP_THREAD_EVERY = 500   # every Nth feedback gets a deep reply chain
+DEEP_THREAD_DEPTH = 60
+BATCH_SIZE = 10_000
+TAG_NAMES = ['communication', 'leadership', 'delivery', 'quality', 'teamwork', 'growth']
+SENTIMENTS = ['positive', 'neutral', 'negative']
+
+def is_seeded():
+    return db.session.query(func.count(Feedback.id)).scalar() > 0
+
+def _insert_batches(table, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+def seed(feedback_rows, rng_seed=42):
+    """Insert feedback_rows feedback (plus users, tags and comments) into an empty database"""
+    rng = random.Random(rng_seed)
+    base_time = datetime(2024, 1, 1)
+    
+    managers = max(1, feedback_rows // FEEDBACK_PER_MANAGER)
+    users = []
+    team_of = {}
+    next_id = 1
+    for m in range(managers):
+        manager_id = next_id
+        users.append({'id': manager_id, 'email': f'manager{m}@bench.local', 'name': f'Manager {m}',
+                      'role': 'manager', 'manager_id': None, 'created_at': base_time})
+        next_id += 1
+        team_of[manager_id] = []
+        for e in range(TEAM_SIZE):
+            users.append({'id': next_id, 'email': f'employee{m}_{e}@bench.local', 'name': f'Employee {m}.{e}',
+                          'role': 'employee', 'manager_id': manager_id, 'created_at': base_time})
+            team_of[manager_id].append(next_id)
+            next_id += 1
+    _insert_batches(User.__table__, users)
+    
+    _insert_batches(Tag.__table__, [
+        {'id': i + 1, 'name': name, 'created_at': base_time} for i, name in enumerate(TAG_NAMES)
+    ])
+    
+    manager_ids = list(team_of)
+    feedback, links, comments = [], [], []
+    comment_id = 1
+    for feedback_id in range(1, feedback_rows + 1):
+        manager_id = manager_ids[(feedback_id - 1) % managers]
+        employee_id = rng.choice(team_of[manager_id])
+        created_at = base_time + timedelta(minutes=feedback_id)
+        # A few flat comments everywhere, plus a deep reply chain now and then
+        depth = DEEP_THREAD_DEPTH if feedback_id % DEEP_THREAD_EVERY == 1 else feedback_id % 4
+        feedback.append({
+            'id': feedback_id, 'manager_id': manager_id, 'employee_id': employee_id,
+            'strengths': f'Strong delivery and clear communication on project {feedback_id % 97}.',
+            'areas_to_improve': f'Could plan milestones earlier; follow up on item {feedback_id % 89}.',
+            'sentiment': SENTIMENTS[feedback_id % 3], 'acknowledged': feedback_id % 2 == 0,
+            'created_at': created_at, 'updated_at': created_at, 'comments_count': depth
+        })
+        for tag_id in rng.sample(range(1, len(TAG_NAMES) + 1), feedback_id % 3):
+            links.append({'feedback_id': feedback_id, 'tag_id': tag_id})
+        
+        parent_id = None
+        for position in range(depth):
+            author = employee_id if position % 2 == 0 else manager_id
+            comments.append({
+                'id': comment_id, 'feedback_id': feedback_id, 'user_id': author,
+                'comment_text': f'Reply {position} on feedback {feedback_id}',
+                'parent_id': parent_id if depth == DEEP_THREAD_DEPTH else None, 'likes': 0,
+                'created_at': created_at + timedelta(seconds=position), 'updated_at': created_at
+            })
+            parent_id = comment_id
+            comment_id += 1
+        
+        if len(feedback) >= BATCH_SIZE:
+            _flush(feedback, links, comments)
+    _flush(feedback, links, comments)
+    # The per-user totals in one grouped pass rather than per row
+    FeedbackStats.reconcile()
+    
+    if db.engine.dialect.name == 'postgresql':
+        # Explicit ids bypassed the sequences; move them past the seeded rows
+        for table in ('users', 'tags', 'feedback', 'feedback_comments'):
+            db.session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            ))
+    db.session.commit()
+
+def _flush(feedback, links, comments):
+    _insert_batches(Feedback.__table__, feedback)
+    _insert_batches(feedback_tags, links)
+    _insert_batches(FeedbackComment.__table__, comments)
+    feedback.clear()
+    links.clear()
+    comments.clear()
+
+def fixtures():
+    """Ids the scenarios need: a manager, one of their employees, their feedback and a deep thread"""
+    manager = User.query.filter_by(role='manager').order_by(User.id).first()
+    employee_id = db.session.query(Feedback.employee_id).filter_by(manager_id=manager.id).order_by(Feedback.id).first()[0]
+    feedback_ids = [row[0] for row in db.session.query(Feedback.id).filter_by(
+        manager_id=manager.id
+    ).order_by(Feedback.id).limit(200)]
+    deep_feedback_id = db.session.query(FeedbackComment.feedback_id).join(
+        Feedback, Feedback.id == FeedbackComment.feedback_id
+    ).filter(
+        Feedback.manager_id == manager.id, FeedbackComment.parent_id.isnot(None)
+    ).order_by(FeedbackComment.id).first()[0]
+    comment_ids = [row[0] for row in db.session.query(FeedbackComment.id).filter_by(
+        feedback_id=deep_feedback_id
+    ).order_by(FeedbackComment.id).limit(20)]
+    return {
+        'manager_id': manager.id,
+        'employee_id': employee_id,
+        'feedback_ids': feedback_ids,
+        'deep_feedback_id': deep_feedback_id,
+        'comment_ids': comment_ids
+    }
@@ -1,5 +1,34 @@
 import os
 from datetime import timedelta
+from sqlalchemy.pool import NullPool
+
+def engine_options(database_uri):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a database URI, driven by DB_* environment
+    variables. SQLite keeps SQLAlchemy's defaults.
+    """
+    if not database_uri.startswith('postgresql'):
+        return {}
+    
+    connect_args = {'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 10))}  # seconds
+    statement_timeout = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))  # 0 disables
+    
+    if os.environ.get('DB_PGBOUNCER', 'False').lower() == 'true':
+        # PgBouncer owns the pooling: hold no idle connections here, and skip the
+        # `options` startup parameter PgBouncer rejects (set statement_timeout
+        # on the database role instead)
+        return {'poolclass': NullPool, 'connect_args': connect_args}
+    
+    if statement_timeout:
+        connect_args['options'] = f'-c statement_timeout={statement_timeout}'
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),  # per worker process
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),  # seconds waiting for a connection
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),  # seconds, below server/proxy idle limits
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true',
+        'connect_args': connect_args
+    }
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
@@ -11,11 +40,72 @@ class Config:
     
     SQLALCHEMY_DATABASE_URI = DATABASE_URL or 'sqlite:///feedback.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    
+    # Readiness probe (/health/ready) reuses one database check for this many seconds
+    HEALTH_DB_CHECK_TTL = float(os.environ.get('HEALTH_DB_CHECK_TTL', 10))
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string'
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
-    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.environ.get('JWT_ACCESS_TOKEN_MINUTES', 15)))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_DAYS', 30)))
+    JWT_TOKEN_LOCATION = ['headers']
+    # Password hashing: Werkzeug method string, e.g. 'pbkdf2:sha256:600000' or 'scrypt:32768:8:1'.
+    # Stored hashes with other parameters are upgraded on the next successful login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 16))  # waiting checks before 503
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))  # seconds
+    LOGIN_RATE_LIMIT_FAILURES = int(os.environ.get('LOGIN_RATE_LIMIT_FAILURES', 5))
+    LOGIN_RATE_LIMIT_WINDOW = int(os.environ.get('LOGIN_RATE_LIMIT_WINDOW', 300))  # seconds
+    
+    # Trust a bare X-User-ID header when no Bearer token is sent. Off by default:
+    # it lets any caller act as any user, so enable it only for legacy scripts
+    AUTH_ALLOW_USER_ID_HEADER = os.environ.get('AUTH_ALLOW_USER_ID_HEADER', 'False').lower() == 'true'
+    
+    # Email notifications (delivered by the outbox dispatcher; log-only when SMTP_HOST is unset)
+    SMTP_HOST = os.environ.get('SMTP_HOST')
+    SMTP_PORT = int(os.environ.get('SMTP_PORT', 25))
+    SMTP_USERNAME = os.environ.get('SMTP_USERNAME')
+    SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
+    SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS', 'False').lower() == 'true'
+    SMTP_TIMEOUT = int(os.environ.get('SMTP_TIMEOUT', 10))
+    MAIL_FROM = os.environ.get('MAIL_FROM', 'noreply@company.com')
+    NOTIFICATION_BATCH_SIZE = int(os.environ.get('NOTIFICATION_BATCH_SIZE', 50))
+    NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', 8))
+    NOTIFICATION_BACKOFF_BASE = int(os.environ.get('NOTIFICATION_BACKOFF_BASE', 30))  # seconds
+    NOTIFICATION_BACKOFF_MAX = int(os.environ.get('NOTIFICATION_BACKOFF_MAX', 3600))  # seconds
+    NOTIFICATION_POLL_INTERVAL = float(os.environ.get('NOTIFICATION_POLL_INTERVAL', 2))  # seconds
+    
+    # Identity cache: users resolved from the database (per worker process)
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 10000))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))  # seconds
+    
+    # Server-sent events (/api/events): 'local' fans out within one process,
+    # 'postgres' uses LISTEN/NOTIFY so events reach clients on every node;
+    # 'auto' picks postgres on PostgreSQL and local on SQLite
+    EVENTS_BACKEND = os.environ.get('EVENTS_BACKEND', 'auto')
+    # Session-mode URL for the LISTEN connection when DATABASE_URL goes through PgBouncer
+    EVENTS_DATABASE_URL = os.environ.get('EVENTS_DATABASE_URL')
+    # Open streams per worker process; each holds a gthread thread, so keep it below --threads
+    EVENTS_MAX_STREAMS = int(os.environ.get('EVENTS_MAX_STREAMS', 4))
+    EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE', 100))  # per connection
+    EVENTS_HEARTBEAT = float(os.environ.get('EVENTS_HEARTBEAT', 15))  # seconds
+    
+    # Rendered PDF cache (per worker process)
+    PDF_CACHE_MAX_ENTRIES = int(os.environ.get('PDF_CACHE_MAX_ENTRIES', 256))
+    PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    
+    # Bulk PDF export jobs (rendered in a process pool, results kept on disk)
+    EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS', 2))
+    EXPORT_MAX_ITEMS = int(os.environ.get('EXPORT_MAX_ITEMS', 500))
+    EXPORT_RETENTION_HOURS = int(os.environ.get('EXPORT_RETENTION_HOURS', 24))
+    EXPORT_JOB_TIMEOUT_MINUTES = int(os.environ.get('EXPORT_JOB_TIMEOUT_MINUTES', 30))  # running longer = lost
+    EXPORT_DIR = os.environ.get('EXPORT_DIR')  # defaults to <instance>/exports
+    
+    # POST /api/feedback/bulk: items per request (JSON array or NDJSON)
+    BULK_FEEDBACK_MAX_ITEMS = int(os.environ.get('BULK_FEEDBACK_MAX_ITEMS', 10000))
     
     # CORS Configuration - Allow Vercel domain
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:3000,https://*.vercel.app').split(',')
@@ -27,12 +117,22 @@ class Config:
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     
+    # Response/request JSON: 'auto' uses orjson when installed, else the stdlib
+    # ('orjson' or 'stdlib' to force one)
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+    
+    # Request instrumentation: Server-Timing header and Prometheus /metrics (per process)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'False').lower() == 'true'
+    METRICS_N_PLUS_ONE_THRESHOLD = int(os.environ.get('METRICS_N_PLUS_ONE_THRESHOLD', 5))  # repeats of one statement
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Bearer token for GET /metrics; unset = not served
+    
     # Port configuration for cloud deployments
     PORT = int(os.environ.get('PORT', 5000))
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///feedback.db'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     FLASK_ENV = 'development'
 
 class ProductionConfig(Config):
@@ -41,10 +141,13 @@ class ProductionConfig(Config):
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
+    # Bearer tokens only, whatever the environment says
+    AUTH_ALLOW_USER_ID_HEADER = False
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     WTF_CSRF_ENABLED = False
 
 config = {
@@ -0,0 +1,21 @@
+import hashlib
+from flask import Response, request
+
+def compute_etag(*parts):
+    """
+    Weak ETag for a response built from the given validator parts (scope
+    versions, caller, query string): equal parts always give the same tag.
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+def not_modified(etag):
+    """A 304 response if the client already holds this ETag, otherwise None"""
+    if request.if_none_match.contains_weak(etag):
+        return with_etag(Response(status=304), etag)
+    return None
+
+def with_etag(response, etag):
+    response.set_etag(etag, weak=True)
+    # Browsers may keep the body but must revalidate before every reuse
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
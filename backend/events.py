@@ -0,0 +1,221 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from flask import current_app
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from models import db
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'feedback_events'
+
+# Reconnect delays for a lost LISTEN connection: 1s, 2s, 4s, ... capped at 30s
+LISTEN_RETRY_BASE = 1
+LISTEN_RETRY_MAX = 30
+
+class Subscription:
+    """One SSE connection's mailbox. Overflow means the client must refetch."""
+    
+    def __init__(self, user_id, max_queued):
+        self.user_id = user_id
+        self.events = queue.Queue(maxsize=max_queued)
+        self.overflowed = False
+    
+    def deliver(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+    
+    def next_event(self, timeout):
+        """The next event, or None if nothing arrived within timeout seconds"""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class LocalBroker:
+    """
+    In-process fan-out: events reach subscribers of this worker process only.
+    At most max_streams subscriptions are open at once, since each holds a
+    request thread for as long as the client stays connected.
+    """
+    
+    def __init__(self, max_queued, max_streams):
+        self.max_queued = max_queued
+        self.max_streams = max_streams
+        self._subscribers = {}
+        self._open = 0
+        self._lock = threading.Lock()
+    
+    def subscribe(self, user_id):
+        """A new subscription, or None when this process already serves max_streams"""
+        subscription = Subscription(user_id, self.max_queued)
+        with self._lock:
+            if self._open >= self.max_streams:
+                return None
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            self._open += 1
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                self._open -= 1
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+    
+    def deliver(self, user_ids, event):
+        with self._lock:
+            targets = [s for user_id in user_ids for s in self._subscribers.get(user_id, ())]
+        for subscription in targets:
+            subscription.deliver(event)
+    
+    def publish(self, user_ids, event):
+        self.deliver(user_ids, event)
+    
+    def resync_all(self):
+        """Events may have been missed: every open stream tells its client to refetch"""
+        with self._lock:
+            targets = [s for subscribers in self._subscribers.values() for s in subscribers]
+        for subscription in targets:
+            subscription.overflowed = True
+
+class PostgresBroker(LocalBroker):
+    """
+    Multi-node fan-out over Postgres LISTEN/NOTIFY: publish sends a NOTIFY and a
+    listener thread in every worker process delivers it to local subscribers
+    (including the publishing process itself). LISTEN needs a session-mode
+    connection, so listen_engine may bypass a transaction-mode PgBouncer; it
+    should not pool, so the LISTEN session never returns to a pool. The
+    listener reconnects with backoff and resyncs open streams afterwards.
+    """
+    
+    def __init__(self, max_queued, max_streams, engine, listen_engine=None):
+        super().__init__(max_queued, max_streams)
+        self.engine = engine
+        self.listen_engine = listen_engine or create_engine(engine.url, poolclass=NullPool)
+        self._listener = None
+        self._listening_since = None
+        self._listener_lock = threading.Lock()
+    
+    def subscribe(self, user_id):
+        self._ensure_listener()
+        return super().subscribe(user_id)
+    
+    def publish(self, user_ids, event):
+        # Payloads are ids only, well under NOTIFY's 8000 byte limit
+        payload = json.dumps({'user_ids': list(user_ids), 'event': event})
+        with self.engine.connect() as connection:
+            connection.execute(text('SELECT pg_notify(:channel, :payload)'), {
+                'channel': NOTIFY_CHANNEL, 'payload': payload
+            })
+            connection.commit()
+    
+    def _ensure_listener(self):
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name='event-listener', daemon=True)
+                self._listener.start()
+    
+    def _listen(self):
+        """Listener thread: keep a LISTEN session open for the life of the process"""
+        delay = LISTEN_RETRY_BASE
+        reconnecting = False
+        while True:
+            self._listening_since = None
+            try:
+                self._listen_once(resync=reconnecting)
+            except Exception as e:
+                if self._listening_since and time.monotonic() - self._listening_since >= LISTEN_RETRY_MAX:
+                    # The session had been up for a while: start the backoff over
+                    delay = LISTEN_RETRY_BASE
+                logger.error(f"Event listener lost its connection, retrying in {delay}s: {str(e)}")
+            reconnecting = True
+            time.sleep(delay)
+            delay = min(delay * 2, LISTEN_RETRY_MAX)
+    
+    def _listen_once(self, resync):
+        connection = self.listen_engine.raw_connection()
+        try:
+            dbapi_connection = connection.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+            self._listening_since = time.monotonic()
+            if resync:
+                # Notifications sent while disconnected are gone
+                self.resync_all()
+            while True:
+                if select.select([dbapi_connection], [], [], 30) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notification = dbapi_connection.notifies.pop(0)
+                    try:
+                        message = json.loads(notification.payload)
+                        self.deliver(message['user_ids'], message['event'])
+                    except (ValueError, KeyError) as e:
+                        logger.error(f"Ignoring malformed event notification: {str(e)}")
+        finally:
+            # An autocommit, LISTENing session must never be reused
+            connection.invalidate()
+
+EVENT_BROKERS = {
+    'local': lambda config: LocalBroker(config['EVENTS_QUEUE_SIZE'], config['EVENTS_MAX_STREAMS']),
+    'postgres': lambda config: PostgresBroker(
+        config['EVENTS_QUEUE_SIZE'], config['EVENTS_MAX_STREAMS'], db.engine,
+        create_engine(config['EVENTS_DATABASE_URL'], poolclass=NullPool) if config.get('EVENTS_DATABASE_URL') else None
+    )
+}
+
+def events_backend(config):
+    """The EVENTS_BACKEND in effect: 'auto' is postgres on PostgreSQL, local otherwise"""
+    name = config.get('EVENTS_BACKEND', 'auto')
+    if name == 'auto':
+        return 'postgres' if config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql') else 'local'
+    return name
+
+def get_event_broker():
+    """Per-app broker, chosen by EVENTS_BACKEND on first use"""
+    broker = current_app.extensions.get('event_broker')
+    if broker is None:
+        config = current_app.config
+        broker = current_app.extensions.setdefault('event_broker', EVENT_BROKERS[events_backend(config)](config))
+    return broker
+
+def publish_event(user_ids, event_type, data):
+    """
+    Push an event to the given users' open streams. Call after the change has
+    been committed; a failure here is logged and never fails the request.
+    """
+    try:
+        get_event_broker().publish({user_id for user_id in user_ids if user_id}, {'type': event_type, 'data': data})
+    except Exception as e:
+        logger.error(f"Failed to publish {event_type} event: {str(e)}")
+
+def format_sse(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+def event_stream(subscription, broker, heartbeat):
+    """SSE body for one subscription; comments keep idle connections open"""
+    try:
+        yield ': connected\n\n'
+        while True:
+            if subscription.overflowed:
+                # Events were dropped for a slow client: tell it to refetch everything
+                subscription.overflowed = False
+                yield format_sse({'type': 'resync', 'data': {}})
+            event = subscription.next_event(heartbeat)
+            if event is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield format_sse(event)
+    finally:
+        broker.unsubscribe(subscription)
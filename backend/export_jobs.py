@@ -0,0 +1,166 @@
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.orm import joinedload
+from models import db, Feedback, FeedbackComment, ExportJob
+from pdf_renderer import report_snapshot, render_reports_pdf, report_filename
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'zip': 'application/zip',
+    'pdf': 'application/pdf'
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """
+    Process pool shared by all export jobs of this worker. 'spawn' keeps the
+    children free of the parent's DB connections and threads.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=current_app.config['EXPORT_WORKERS'],
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+def export_dir():
+    """
+    Where finished exports are written. Downloads read the file back from
+    here, so every backend instance must see the same directory: the default
+    is local to one host (single-node only); point EXPORT_DIR at a shared
+    volume when running several containers.
+    """
+    path = current_app.config.get('EXPORT_DIR') or os.path.join(current_app.instance_path, 'exports')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def load_reports(feedback_ids):
+    """Snapshot the given feedback and their comments with two queries"""
+    feedback_list = Feedback.query.options(
+        joinedload(Feedback.manager), joinedload(Feedback.employee)
+    ).filter(Feedback.id.in_(feedback_ids)).order_by(Feedback.created_at.asc(), Feedback.id.asc()).all()
+    
+    comments_by_feedback = {}
+    comments = FeedbackComment.query.filter(FeedbackComment.feedback_id.in_(feedback_ids)).order_by(
+        FeedbackComment.created_at.asc(), FeedbackComment.id.asc()
+    ).all()
+    for comment in comments:
+        comments_by_feedback.setdefault(comment.feedback_id, []).append(comment)
+    
+    return [report_snapshot(f, comments_by_feedback.get(f.id, [])) for f in feedback_list]
+
+def build_export(reports, export_format, path):
+    """
+    Runs in a pool process: render the reports into a ZIP of PDFs or one
+    combined PDF. Written to a temporary name first so a half-written file
+    is never served.
+    """
+    tmp_path = path + '.part'
+    if export_format == 'pdf':
+        with open(tmp_path, 'wb') as output:
+            output.write(render_reports_pdf(reports))
+    else:
+        with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for report in reports:
+                filename = report_filename(report['employee_name'], report['created_at'])
+                # Feedback id keeps names unique for same-day entries
+                archive.writestr(filename.replace('.pdf', f"_{report['feedback_id']}.pdf"), render_reports_pdf([report]))
+    os.replace(tmp_path, path)
+    return path
+
+def start_export_job(owner_id, feedback_ids, export_format):
+    """Create the job row and hand rendering to the process pool"""
+    purge_expired_jobs()
+    
+    job = ExportJob(
+        id=uuid.uuid4().hex,
+        owner_id=owner_id,
+        format=export_format,
+        status='running',
+        item_count=len(feedback_ids)
+    )
+    reports = load_reports(feedback_ids)
+    db.session.add(job)
+    db.session.commit()
+    
+    path = os.path.join(export_dir(), f'{job.id}.{export_format}')
+    app = current_app._get_current_object()
+    job_id = job.id
+    try:
+        future = get_executor().submit(build_export, reports, export_format, path)
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)[:500]
+        job.completed_at = datetime.utcnow()
+        db.session.commit()
+        raise
+    future.add_done_callback(lambda done: _finish_job(app, job_id, done))
+    return job
+
+def _finish_job(app, job_id, future):
+    """Pool callback: record the outcome of a render"""
+    with app.app_context():
+        try:
+            job = db.session.get(ExportJob, job_id)
+            if not job:
+                return
+            error = future.exception()
+            if error:
+                logger.error(f"Export job {job_id} failed: {str(error)}")
+                job.status = 'failed'
+                job.error = str(error)[:500]
+            else:
+                job.status = 'completed'
+                job.file_path = future.result()
+            job.completed_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to record export job {job_id}: {str(e)}")
+
+def _stale_cutoff():
+    return datetime.utcnow() - timedelta(minutes=current_app.config['EXPORT_JOB_TIMEOUT_MINUTES'])
+
+def _mark_stale(job):
+    job.status = 'failed'
+    job.error = 'Export did not finish in time (the worker may have restarted)'
+    job.completed_at = datetime.utcnow()
+
+def fail_if_stale(job):
+    """
+    Mark a job failed when it is still 'running' past EXPORT_JOB_TIMEOUT_MINUTES:
+    its pool process died with the worker, so no callback will ever finish it.
+    """
+    if job.status == 'running' and job.created_at < _stale_cutoff():
+        _mark_stale(job)
+        db.session.commit()
+
+def purge_expired_jobs():
+    """
+    Fail jobs left running past their deadline, then drop jobs (and their
+    files) older than EXPORT_RETENTION_HOURS
+    """
+    stale = ExportJob.query.filter(ExportJob.status == 'running', ExportJob.created_at < _stale_cutoff()).all()
+    for job in stale:
+        _mark_stale(job)
+    
+    cutoff = datetime.utcnow() - timedelta(hours=current_app.config['EXPORT_RETENTION_HOURS'])
+    expired = ExportJob.query.filter(ExportJob.created_at < cutoff).all()
+    for job in expired:
+        if job.file_path and os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        db.session.delete(job)
+    if stale or expired:
+        db.session.commit()
@@ -0,0 +1,83 @@
+import csv
+import io
+from datetime import datetime
+from itertools import islice
+from flask import current_app
+from models import db, Feedback, Tag, feedback_tags
+from identity import get_users
+
+EXPORT_STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+# Rows fetched from the cursor, enriched and written per chunk
+STREAM_BATCH_SIZE = 1000
+
+CSV_COLUMNS = [
+    'id', 'manager_id', 'manager_name', 'employee_id', 'employee_name', 'sentiment', 'acknowledged',
+    'tags', 'comments_count', 'strengths', 'areas_to_improve', 'created_at', 'updated_at'
+]
+
+def export_batches(query, batch_size=STREAM_BATCH_SIZE):
+    """
+    The feedback matched by query, oldest first, as lists of row dicts (the
+    listing's fields). Rows come off one server-side cursor (yield_per
+    implies stream_results), and each batch adds its names and tags with two
+    lookups, so memory is bounded by batch_size.
+    """
+    rows = iter(query.with_entities(*Feedback.list_columns()).order_by(None).order_by(
+        Feedback.created_at.asc(), Feedback.id.asc()
+    ).yield_per(batch_size))
+    
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        feedback_ids = [row.id for row in batch]
+        
+        tag_names = {}
+        for feedback_id, name in db.session.query(feedback_tags.c.feedback_id, Tag.name).join(
+            Tag, Tag.id == feedback_tags.c.tag_id
+        ).filter(feedback_tags.c.feedback_id.in_(feedback_ids)).order_by(Tag.name):
+            tag_names.setdefault(feedback_id, []).append(name)
+        user_names = {
+            user_id: user['name']
+            for user_id, user in get_users({row.manager_id for row in batch} | {row.employee_id for row in batch}).items()
+        }
+        
+        yield [
+            Feedback.serialize(row, user_names, tag_names.get(row.id, []))
+            for row in batch
+        ]
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ';'.join(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def stream_ndjson(batches):
+    dumps = current_app.json.dumps
+    for batch in batches:
+        yield ''.join(dumps(row) + '\n' for row in batch)
+
+def stream_csv(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([_csv_value(row[column]) for column in CSV_COLUMNS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: nothing matched
+        yield buffer.getvalue()
+
+STREAM_WRITERS = {
+    'ndjson': stream_ndjson,
+    'csv': stream_csv
+}
@@ -0,0 +1,16 @@
+"""
+Gunicorn settings, loaded automatically when gunicorn starts in backend/.
+Worker, thread and bind options stay on the start commands.
+"""
+from config import Config
+from events import events_backend
+
+def on_starting(server):
+    # Local event fan-out only reaches streams held by the publishing process,
+    # so with several workers most events would silently go missing
+    config = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+    if server.cfg.workers > 1 and events_backend(config) == 'local':
+        raise RuntimeError(
+            'EVENTS_BACKEND=local cannot serve more than one gunicorn worker; '
+            'use EVENTS_BACKEND=postgres (or auto with PostgreSQL), or run a single worker'
+        )
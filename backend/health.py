@@ -0,0 +1,65 @@
+import threading
+import time
+from flask import current_app
+from sqlalchemy import text
+from models import db
+
+class DatabaseProbe:
+    """
+    Cached database reachability for readiness probes: at most one SELECT 1
+    per ttl seconds per worker process, however many probes arrive.
+    """
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def check(self, engine):
+        """(reachable, detail), from cache while fresh"""
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+        # One thread refreshes; concurrent probes reuse the previous result meanwhile
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                try:
+                    with engine.connect() as connection:
+                        connection.execute(text('SELECT 1'))
+                    self._result = (True, 'connected')
+                except Exception as e:
+                    self._result = (False, f"disconnected: {str(e)}")
+                self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
+
+def get_database_probe():
+    """Per-app probe, created on first use from HEALTH_DB_CHECK_TTL"""
+    probe = current_app.extensions.get('database_probe')
+    if probe is None:
+        probe = current_app.extensions.setdefault(
+            'database_probe', DatabaseProbe(current_app.config['HEALTH_DB_CHECK_TTL'])
+        )
+    return probe
+
+def pool_stats(engine):
+    """Connection pool occupancy of this worker process (no database round trip)"""
+    pool = engine.pool
+    stats = {'class': type(pool).__name__}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
+
+def readiness():
+    """(ready, body) for the readiness probe"""
+    reachable, detail = get_database_probe().check(db.engine)
+    return reachable, {
+        'status': 'ready' if reachable else 'unavailable',
+        'database': detail,
+        'pool': pool_stats(db.engine)
+    }
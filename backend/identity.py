@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, request
+from models import User
+from tokens import current_token_user
+
+# Fields exposed for a user to routes and serializers
+IDENTITY_FIELDS = ('id', 'name', 'email', 'role', 'manager_id')
+
+class UserCache:
+    """Thread-safe LRU cache of user identities with a per-entry TTL"""
+    
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_many(self, user_ids):
+        """Return {id: identity} for the cached, unexpired ids"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is None:
+                    continue
+                expires_at, identity = entry
+                if expires_at <= now:
+                    del self._entries[user_id]
+                    continue
+                self._entries.move_to_end(user_id)
+                found[user_id] = identity
+        return found
+    
+    def put_many(self, identities):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for identity in identities:
+                self._entries[identity['id']] = (expires_at, identity)
+                self._entries.move_to_end(identity['id'])
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id=None):
+        """Drop one user, or everything when user_id is None"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+    
+    def __len__(self):
+        return len(self._entries)
+
+def get_user_cache():
+    """Per-app user cache, created on first use from USER_CACHE_* config"""
+    cache = current_app.extensions.get('user_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('user_cache', UserCache(
+            current_app.config['USER_CACHE_MAX_ENTRIES'],
+            current_app.config['USER_CACHE_TTL']
+        ))
+    return cache
+
+def _identity(user):
+    return {field: getattr(user, field) for field in IDENTITY_FIELDS}
+
+def get_users(user_ids):
+    """
+    Resolve many user ids to identity dicts ({id: identity}), serving hits from
+    the cache and loading all misses with a single query. Unknown ids are omitted.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return {}
+    
+    cache = get_user_cache()
+    users = cache.get_many(user_ids)
+    missing = user_ids - users.keys()
+    if missing:
+        loaded = [_identity(user) for user in User.query.filter(User.id.in_(missing)).all()]
+        cache.put_many(loaded)
+        users.update((identity['id'], identity) for identity in loaded)
+    return users
+
+def get_user(user_id):
+    """Resolve one user id to an identity dict, or None if there is no such user"""
+    return get_users([user_id]).get(user_id)
+
+def invalidate_user(user_id=None):
+    """Forget a cached user (or all users) after changing the users table"""
+    get_user_cache().invalidate(user_id)
+
+def get_current_user_from_request():
+    """
+    Resolve the caller. A Bearer access token is verified from its claims alone
+    (no database access); the legacy X-User-ID header is only honoured while
+    AUTH_ALLOW_USER_ID_HEADER is enabled.
+    """
+    if request.headers.get('Authorization'):
+        return current_token_user()
+    
+    if not current_app.config['AUTH_ALLOW_USER_ID_HEADER']:
+        return None
+    
+    user_id = request.headers.get('X-User-ID')
+    if not user_id:
+        return None
+    
+    try:
+        return get_user(int(user_id))
+    except (ValueError, TypeError):
+        return None
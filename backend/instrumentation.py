@@ -0,0 +1,184 @@
+import hmac
+import logging
+import threading
+import time
+from collections import Counter
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+class RequestProfile:
+    """Per-request counters, kept on flask.g while a request is running"""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False  # inside a timed encoder call (response() may call dumps())
+        self.statements = Counter()
+    
+    def repeated_statements(self, threshold):
+        """Statements issued at least threshold times: the signature of an N+1 loop"""
+        return [(sql, count) for sql, count in self.statements.items() if count >= threshold]
+
+class MetricsRegistry:
+    """Thread-safe per-process aggregates, rendered in Prometheus text format"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = Counter()
+        self._sql_queries = Counter()
+        self._sql_seconds = Counter()
+        self._serialize_seconds = Counter()
+        self._n_plus_one = Counter()
+        self._duration_sum = Counter()
+        self._duration_buckets = {}
+    
+    def observe(self, method, endpoint, status, duration, profile, n_plus_one):
+        with self._lock:
+            self._requests[(method, endpoint, status)] += 1
+            self._sql_queries[endpoint] += profile.sql_count
+            self._sql_seconds[endpoint] += profile.sql_time
+            self._serialize_seconds[endpoint] += profile.serialize_time
+            if n_plus_one:
+                self._n_plus_one[endpoint] += 1
+            self._duration_sum[endpoint] += duration
+            buckets = self._duration_buckets.setdefault(endpoint, [0] * (len(DURATION_BUCKETS) + 1))
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    buckets[index] += 1
+            buckets[-1] += 1
+    
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += [
+                '# HELP http_requests_total Requests handled, by method, endpoint and status.',
+                '# TYPE http_requests_total counter'
+            ]
+            for (method, endpoint, status), count in sorted(self._requests.items()):
+                lines.append(f'http_requests_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}')
+            
+            lines += [
+                '# HELP http_request_duration_seconds Wall time until the response was ready.',
+                '# TYPE http_request_duration_seconds histogram'
+            ]
+            for endpoint, buckets in sorted(self._duration_buckets.items()):
+                for bound, count in zip(DURATION_BUCKETS, buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {buckets[-1]}')
+                lines.append(f'http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {self._duration_sum[endpoint]:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{endpoint="{endpoint}"}} {buckets[-1]}')
+            
+            for name, help_text, values, fmt in (
+                ('http_request_sql_queries_total', 'SQL statements executed while handling requests.', self._sql_queries, '{}'),
+                ('http_request_sql_seconds_total', 'Time spent executing SQL while handling requests.', self._sql_seconds, '{:.6f}'),
+                ('http_request_serialize_seconds_total', 'Time spent encoding JSON responses.', self._serialize_seconds, '{:.6f}'),
+                ('http_request_n_plus_one_total', 'Requests that repeated one SQL statement N+1 style.', self._n_plus_one, '{}'),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for endpoint, value in sorted(values.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {fmt.format(value)}')
+        return '\n'.join(lines) + '\n'
+
+def _current_profile():
+    if has_request_context():
+        return g.get('request_profile')
+    return None
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile() is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile()
+    if profile is None or not conn.info.get('query_started'):
+        return
+    profile.sql_time += time.perf_counter() - conn.info['query_started'].pop()
+    profile.sql_count += 1
+    # Statements are parameterized, so a loop issues the identical string each time
+    profile.statements[statement] += 1
+
+def _timed_serializer(encode):
+    """Wrap a JSON provider method so its time counts as serialization (outermost call only)"""
+    def timed(*args, **kwargs):
+        profile = _current_profile()
+        if profile is None or profile.serializing:
+            return encode(*args, **kwargs)
+        profile.serializing = True
+        started = time.perf_counter()
+        try:
+            return encode(*args, **kwargs)
+        finally:
+            profile.serialize_time += time.perf_counter() - started
+            profile.serializing = False
+    return timed
+
+def init_instrumentation(app):
+    """
+    Opt-in (METRICS_ENABLED) per-request profiling: wall time, SQL count and
+    time, JSON encoding time and N+1 detection, reported in a Server-Timing
+    header and aggregated for GET /metrics (Prometheus text format), which
+    is only served with METRICS_TOKEN set and requires it as a Bearer token.
+    """
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    
+    registry = MetricsRegistry()
+    app.extensions['metrics'] = registry
+    threshold = app.config['METRICS_N_PLUS_ONE_THRESHOLD']
+    
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    # dumps() for streamed and direct encodes, response() for jsonify (orjson
+    # encodes there without going through dumps)
+    app.json.dumps = _timed_serializer(app.json.dumps)
+    app.json.response = _timed_serializer(app.json.response)
+    
+    @app.before_request
+    def start_profile():
+        g.request_profile = RequestProfile()
+    
+    @app.after_request
+    def record_profile(response):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return response
+        duration = time.perf_counter() - profile.started
+        endpoint = request.endpoint or 'unmatched'
+        
+        repeated = profile.repeated_statements(threshold)
+        for statement, count in repeated:
+            logger.warning(
+                f"Possible N+1 in {request.method} {endpoint}: statement ran {count} times: "
+                f"{' '.join(statement.split())[:200]}"
+            )
+        
+        registry.observe(request.method, endpoint, response.status_code, duration, profile, bool(repeated))
+        response.headers['Server-Timing'] = ', '.join([
+            f'app;dur={duration * 1000:.1f}',
+            f'db;dur={profile.sql_time * 1000:.1f};desc="{profile.sql_count} queries"',
+            f'serialize;dur={profile.serialize_time * 1000:.1f}'
+        ])
+        return response
+    
+    token = app.config.get('METRICS_TOKEN')
+    if not token:
+        logger.warning("METRICS_ENABLED without METRICS_TOKEN: /metrics is not served")
+        return
+    
+    @app.route('/metrics')
+    def metrics():
+        # Endpoint names, timings and N+1 counts are internal; only the scraper may read them
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+            return Response('Unauthorized\n', status=401, mimetype='text/plain',
+                            headers={'WWW-Authenticate': 'Bearer'})
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,74 @@
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib provider is used instead
+    orjson = None
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """
+    Flask's stdlib provider, except that datetimes are written as ISO 8601
+    (like orjson) rather than HTTP dates, so serializers can hand datetime
+    values over as they come from the database.
+    """
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+class OrjsonProvider(IsoJSONProvider):
+    """
+    orjson for every response and request body: native datetime, UUID and
+    dataclass encoding in C. Values orjson refuses (e.g. integers beyond 64
+    bits) and calls with stdlib options fall back to IsoJSONProvider.
+    """
+    
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Same argument rules as jsonify()
+        if args and kwargs:
+            raise TypeError('app.json.response() takes either args or kwargs, not both')
+        obj = (args[0] if len(args) == 1 else args) if args else (kwargs or None)
+        options = self._options()
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        try:
+            body = orjson.dumps(obj, default=self.default, option=options | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            return super().response(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+JSON_PROVIDERS = {
+    'orjson': OrjsonProvider,
+    'stdlib': IsoJSONProvider
+}
+
+def init_json(app):
+    """Install the JSON_PROVIDER chosen in config ('auto': orjson when installed)"""
+    name = app.config.get('JSON_PROVIDER', 'auto')
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_PROVIDER=orjson but orjson is not installed')
+    app.json = JSON_PROVIDERS[name](app)
@@ -0,0 +1,95 @@
+"""add full text search
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 04:05:12.418203
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+# Postgres: expression GIN indexes; search.py must query the same expressions
+POSTGRES_UPGRADE = [
+    "CREATE INDEX ix_feedback_fts ON feedback "
+    "USING gin (to_tsvector('english', strengths || ' ' || areas_to_improve))",
+    "CREATE INDEX ix_feedback_comments_fts ON feedback_comments "
+    "USING gin (to_tsvector('english', comment_text))",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_feedback_comments_fts",
+    "DROP INDEX IF EXISTS ix_feedback_fts",
+]
+
+# SQLite (local dev): FTS5 external-content tables kept in sync by triggers
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE feedback_fts USING fts5("
+    "strengths, areas_to_improve, content='feedback', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER feedback_fts_ai AFTER INSERT ON feedback BEGIN "
+    "INSERT INTO feedback_fts(rowid, strengths, areas_to_improve) "
+    "VALUES (new.id, new.strengths, new.areas_to_improve); "
+    "END",
+    "CREATE TRIGGER feedback_fts_ad AFTER DELETE ON feedback BEGIN "
+    "INSERT INTO feedback_fts(feedback_fts, rowid, strengths, areas_to_improve) "
+    "VALUES ('delete', old.id, old.strengths, old.areas_to_improve); "
+    "END",
+    "CREATE TRIGGER feedback_fts_au AFTER UPDATE OF strengths, areas_to_improve ON feedback BEGIN "
+    "INSERT INTO feedback_fts(feedback_fts, rowid, strengths, areas_to_improve) "
+    "VALUES ('delete', old.id, old.strengths, old.areas_to_improve); "
+    "INSERT INTO feedback_fts(rowid, strengths, areas_to_improve) "
+    "VALUES (new.id, new.strengths, new.areas_to_improve); "
+    "END",
+    "INSERT INTO feedback_fts(feedback_fts) VALUES ('rebuild')",
+    "CREATE VIRTUAL TABLE feedback_comments_fts USING fts5("
+    "comment_text, content='feedback_comments', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER feedback_comments_fts_ai AFTER INSERT ON feedback_comments BEGIN "
+    "INSERT INTO feedback_comments_fts(rowid, comment_text) VALUES (new.id, new.comment_text); "
+    "END",
+    "CREATE TRIGGER feedback_comments_fts_ad AFTER DELETE ON feedback_comments BEGIN "
+    "INSERT INTO feedback_comments_fts(feedback_comments_fts, rowid, comment_text) "
+    "VALUES ('delete', old.id, old.comment_text); "
+    "END",
+    "CREATE TRIGGER feedback_comments_fts_au AFTER UPDATE OF comment_text ON feedback_comments BEGIN "
+    "INSERT INTO feedback_comments_fts(feedback_comments_fts, rowid, comment_text) "
+    "VALUES ('delete', old.id, old.comment_text); "
+    "INSERT INTO feedback_comments_fts(rowid, comment_text) VALUES (new.id, new.comment_text); "
+    "END",
+    "INSERT INTO feedback_comments_fts(feedback_comments_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS feedback_comments_fts_au",
+    "DROP TRIGGER IF EXISTS feedback_comments_fts_ad",
+    "DROP TRIGGER IF EXISTS feedback_comments_fts_ai",
+    "DROP TABLE IF EXISTS feedback_comments_fts",
+    "DROP TRIGGER IF EXISTS feedback_fts_au",
+    "DROP TRIGGER IF EXISTS feedback_fts_ad",
+    "DROP TRIGGER IF EXISTS feedback_fts_ai",
+    "DROP TABLE IF EXISTS feedback_fts",
+]
+
+
+def _statements(postgres, sqlite):
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgres
+    if dialect == 'sqlite':
+        return sqlite
+    return []
+
+
+def upgrade():
+    for statement in _statements(POSTGRES_UPGRADE, SQLITE_UPGRADE):
+        op.execute(statement)
+
+
+def downgrade():
+    for statement in _statements(POSTGRES_DOWNGRADE, SQLITE_DOWNGRADE):
+        op.execute(statement)
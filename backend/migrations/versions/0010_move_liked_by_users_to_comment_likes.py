@@ -0,0 +1,85 @@
+"""move liked_by_users to comment likes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 05:10:12.402817
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+comment_likes = sa.table(
+    'comment_likes',
+    sa.column('comment_id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('created_at', sa.DateTime)
+)
+
+
+def _user_ids(liked_by_users):
+    """The distinct user ids of a comma-separated liked_by_users value, skipping junk"""
+    user_ids = []
+    for part in (liked_by_users or '').split(','):
+        part = part.strip()
+        if part.isdigit() and int(part) not in user_ids:
+            user_ids.append(int(part))
+    return user_ids
+
+
+def upgrade():
+    connection = op.get_bind()
+    now = datetime.utcnow()
+    
+    # One comment_likes row per user listed in liked_by_users
+    rows = []
+    result = connection.execute(sa.text(
+        "SELECT id, liked_by_users FROM feedback_comments "
+        "WHERE liked_by_users IS NOT NULL AND liked_by_users != ''"
+    ))
+    for comment_id, liked_by_users in result:
+        rows.extend(
+            {'comment_id': comment_id, 'user_id': user_id, 'created_at': now}
+            for user_id in _user_ids(liked_by_users)
+        )
+        if len(rows) >= BATCH_SIZE:
+            op.bulk_insert(comment_likes, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(comment_likes, rows)
+    
+    # likes becomes the number of like rows, as the app maintains it from now on
+    op.execute(
+        "UPDATE feedback_comments SET likes = "
+        "(SELECT COUNT(*) FROM comment_likes WHERE comment_likes.comment_id = feedback_comments.id)"
+    )
+    
+    # Plain ALTER rather than batch: a batch rebuild of feedback_comments on SQLite
+    # would drop its full-text search triggers (needs SQLite 3.35+)
+    op.drop_column('feedback_comments', 'liked_by_users')
+
+
+def downgrade():
+    op.add_column('feedback_comments', sa.Column('liked_by_users', sa.Text(), nullable=True))
+    
+    connection = op.get_bind()
+    liked_by = {}
+    for comment_id, user_id in connection.execute(sa.text(
+        "SELECT comment_id, user_id FROM comment_likes ORDER BY comment_id, id"
+    )):
+        liked_by.setdefault(comment_id, []).append(str(user_id))
+    for comment_id, user_ids in liked_by.items():
+        connection.execute(
+            sa.text("UPDATE feedback_comments SET liked_by_users = :liked_by_users WHERE id = :id"),
+            {'liked_by_users': ','.join(user_ids), 'id': comment_id}
+        )
+    op.execute("DELETE FROM comment_likes")
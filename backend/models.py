@@ -1,11 +1,29 @@
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import func, insert, update, delete, select, literal, bindparam, or_, and_
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from werkzeug.security import check_password_hash
+from passwords import hash_password
 from datetime import datetime
 
 db = SQLAlchemy()
 
+# Recursive comment-thread statements, built on first use (see FeedbackComment.descendants_statement)
+_DESCENDANT_STATEMENTS = {}
+
+def _users_by_id(user_ids):
+    """Batch identity lookup through the cached identity service"""
+    # Imported here because identity imports the models
+    from identity import get_users
+    return get_users(user_ids)
+
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_manager_id', 'manager_id'),
+        db.Index('ix_users_role', 'role'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -15,19 +33,28 @@ class User(db.Model):
     manager_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Fields list endpoints may return (?fields=); never the password hash
+    LIST_FIELDS = ('id', 'email', 'name', 'role', 'manager_id', 'created_at')
+    
     # Relationships
     team_members = db.relationship('User', backref=db.backref('manager', remote_side=[id]))
     given_feedback = db.relationship('Feedback', foreign_keys='Feedback.manager_id', backref='manager')
     received_feedback = db.relationship('Feedback', foreign_keys='Feedback.employee_id', backref='employee')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         if not self.password_hash:
             return False
         return check_password_hash(self.password_hash, password)
     
+    @staticmethod
+    def list_rows(fields, *criteria):
+        """Dicts of the given LIST_FIELDS for the users matching criteria, selected as plain columns"""
+        rows = db.session.query(*[getattr(User, name) for name in fields]).filter(*criteria).all()
+        return [row._asdict() for row in rows]
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -35,11 +62,62 @@ class User(db.Model):
             'name': self.name,
             'role': self.role,
             'manager_id': self.manager_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
+# Many-to-many link between feedback and normalized tags
+feedback_tags = db.Table(
+    'feedback_tags',
+    db.Column('feedback_id', db.Integer, db.ForeignKey('feedback.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    # "All feedback tagged X" starts from the tag side
+    db.Index('ix_feedback_tags_tag_feedback', 'tag_id', 'feedback_id')
+)
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @staticmethod
+    def normalize_names(tags):
+        """
+        Clean a request's tag list: accepts strings or {'name': ...} objects,
+        strips whitespace and drops empties and duplicates (first one wins)
+        """
+        names = []
+        for tag in tags or []:
+            if isinstance(tag, dict) and 'name' in tag:
+                tag = tag['name']
+            if not isinstance(tag, str):
+                continue
+            name = tag.strip()[:50]
+            if name and name not in names:
+                names.append(name)
+        return names
+    
+    @staticmethod
+    def get_or_create_many(names):
+        """Resolve tag names to Tag rows, inserting missing ones race-free"""
+        if not names:
+            return []
+        insert_stmt = _insert_for_dialect(Tag).values([
+            {'name': name, 'created_at': datetime.utcnow()} for name in names
+        ])
+        db.session.execute(insert_stmt.on_conflict_do_nothing(index_elements=['name']))
+        tags = Tag.query.filter(Tag.name.in_(names)).all()
+        by_name = {tag.name: tag for tag in tags}
+        return [by_name[name] for name in names]
+
 class Feedback(db.Model):
     __tablename__ = 'feedback'
+    __table_args__ = (
+        # Listing/dashboard: WHERE manager_id|employee_id = ? ORDER BY created_at DESC, id DESC
+        db.Index('ix_feedback_manager_created', 'manager_id', 'created_at', 'id'),
+        db.Index('ix_feedback_employee_created', 'employee_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     manager_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -48,127 +126,707 @@ class Feedback(db.Model):
     areas_to_improve = db.Column(db.Text, nullable=False)
     sentiment = db.Column(db.String(20), nullable=False)  # 'positive', 'neutral', 'negative'
     acknowledged = db.Column(db.Boolean, default=False)
-    tags = db.Column(db.String(200), nullable=True)  # Comma-separated tags
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained by adjust_comments_count() in the transaction that adds or removes a comment
+    comments_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    # Serialized fields (?fields=); the Text bodies are left out of summaries unless asked for
+    LIST_FIELDS = (
+        'id', 'manager_id', 'employee_id', 'manager_name', 'employee_name', 'strengths', 'areas_to_improve',
+        'sentiment', 'acknowledged', 'tags', 'created_at', 'updated_at', 'comments_count'
+    )
+    TEXT_FIELDS = ('strengths', 'areas_to_improve')
     
     # Relationship for comments
     comments = db.relationship('FeedbackComment', backref='feedback', lazy=True, cascade='all, delete-orphan')
+    tags = db.relationship('Tag', secondary=feedback_tags, lazy=True, order_by='Tag.name')
     
-    def to_dict(self):
+    def set_tags(self, tags):
+        """Replace this feedback's tags from a request's tag list"""
+        self.tags = Tag.get_or_create_many(Tag.normalize_names(tags))
+    
+    @staticmethod
+    def insert_many(manager_id, items):
+        """
+        Insert many already-validated feedback items (dicts with employee_id,
+        strengths, areas_to_improve, sentiment and optional tags) with one
+        executemany for the rows and one for their tags. Returns the new ids in
+        item order; the caller commits.
+        """
+        if not items:
+            return []
+        now = datetime.utcnow()
+        rows = [{
+            'manager_id': manager_id,
+            'employee_id': item['employee_id'],
+            'strengths': item['strengths'],
+            'areas_to_improve': item['areas_to_improve'],
+            'sentiment': item['sentiment'],
+            'acknowledged': False,
+            'created_at': now,
+            'updated_at': now
+        } for item in items]
+        table = Feedback.__table__
+        feedback_ids = db.session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        
+        tag_names = [Tag.normalize_names(item.get('tags')) for item in items]
+        all_names = list(dict.fromkeys(name for names in tag_names for name in names))
+        if all_names:
+            tag_ids = {tag.name: tag.id for tag in Tag.get_or_create_many(all_names)}
+            db.session.execute(insert(feedback_tags), [
+                {'feedback_id': feedback_id, 'tag_id': tag_ids[name]}
+                for feedback_id, names in zip(feedback_ids, tag_names)
+                for name in names
+            ])
+        FeedbackStats.adjust(added=[
+            (manager_id, item['employee_id'], item['sentiment'], False) for item in items
+        ])
+        return feedback_ids
+    
+    def counted_state(self):
+        """The fields FeedbackStats counts, for FeedbackStats.adjust() before and after a change"""
+        return (self.manager_id, self.employee_id, self.sentiment, bool(self.acknowledged))
+    
+    def acknowledge(self):
+        """
+        Mark acknowledged with a conditional UPDATE and count it once, so
+        concurrent acknowledgements can't count twice; returns False if it
+        already was. The caller commits.
+        """
+        result = db.session.execute(
+            update(Feedback)
+            .where(Feedback.id == self.id, Feedback.acknowledged.isnot(True))
+            .values(acknowledged=True)
+            .execution_options(synchronize_session='fetch')
+        )
+        if not result.rowcount:
+            return False
+        before = (self.manager_id, self.employee_id, self.sentiment, False)
+        FeedbackStats.adjust(removed=[before], added=[before[:3] + (True,)])
+        return True
+    
+    @staticmethod
+    def adjust_comments_count(feedback_id, delta):
+        """Atomically add delta to a feedback's comments_count (updated_at is left alone)"""
+        db.session.execute(
+            update(Feedback)
+            .where(Feedback.id == feedback_id)
+            .values(comments_count=Feedback.comments_count + delta, updated_at=Feedback.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def reconcile_comments_count():
+        """Recount comments_count where it drifted; returns the number of rows repaired"""
+        actual = db.session.query(func.count(FeedbackComment.id)).filter(
+            FeedbackComment.feedback_id == Feedback.id
+        ).scalar_subquery()
+        result = db.session.execute(
+            update(Feedback)
+            .where(Feedback.comments_count != actual)
+            .values(comments_count=actual, updated_at=Feedback.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    @staticmethod
+    def list_columns():
+        """Columns the listing serializer reads, for projected (entity-free) queries"""
+        return (
+            Feedback.id, Feedback.manager_id, Feedback.employee_id, Feedback.strengths,
+            Feedback.areas_to_improve, Feedback.sentiment, Feedback.acknowledged,
+            Feedback.created_at, Feedback.updated_at, Feedback.comments_count
+        )
+    
+    @staticmethod
+    def serialize(row, user_names, tag_names):
+        """API dict for a Feedback or a row of list_columns(); datetimes stay native"""
         return {
-            'id': self.id,
-            'manager_id': self.manager_id,
-            'employee_id': self.employee_id,
-            'manager_name': self.manager.name,
-            'employee_name': self.employee.name,
-            'strengths': self.strengths,
-            'areas_to_improve': self.areas_to_improve,
-            'sentiment': self.sentiment,
-            'acknowledged': self.acknowledged,
-            'tags': self.tags.split(',') if self.tags else [],
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'comments_count': len(self.comments) if self.comments else 0
+            'id': row.id,
+            'manager_id': row.manager_id,
+            'employee_id': row.employee_id,
+            'manager_name': user_names.get(row.manager_id),
+            'employee_name': user_names.get(row.employee_id),
+            'strengths': row.strengths,
+            'areas_to_improve': row.areas_to_improve,
+            'sentiment': row.sentiment,
+            'acknowledged': row.acknowledged,
+            'tags': tag_names,
+            'created_at': row.created_at,
+            'updated_at': row.updated_at,
+            'comments_count': row.comments_count
         }
+    
+    def to_dict(self, user_names=None, tag_names=None):
+        if tag_names is None:
+            tag_names = [tag.name for tag in self.tags]
+        if user_names is None:
+            user_names = {
+                user_id: user['name'] for user_id, user in _users_by_id([self.manager_id, self.employee_id]).items()
+            }
+        return Feedback.serialize(self, user_names, tag_names)
+    
+    @staticmethod
+    def scope_version(owner_column, user_id):
+        """
+        Cheap change validator for the feedback given or received by a user and
+        the comments on it: row counts plus latest updated_at, from two aggregates.
+        Any insert, edit, acknowledge, delete, comment or like changes the result.
+        """
+        feedback_count, feedback_updated = db.session.query(
+            func.count(Feedback.id), func.max(Feedback.updated_at)
+        ).filter(owner_column == user_id).one()
+        comments_count, comments_updated = db.session.query(
+            func.count(FeedbackComment.id), func.max(FeedbackComment.updated_at)
+        ).join(Feedback, Feedback.id == FeedbackComment.feedback_id).filter(owner_column == user_id).one()
+        return (feedback_count, feedback_updated, comments_count, comments_updated)
+    
+    @staticmethod
+    def latest_ids_by_employee(manager_id):
+        """
+        Ids of the newest feedback a manager gave each team member: one indexed
+        LIMIT 1 lookup per member rather than a pass over the whole history
+        """
+        given = aliased(Feedback)
+        latest_id = db.session.query(given.id).filter(
+            given.employee_id == User.id, given.manager_id == manager_id
+        ).order_by(given.created_at.desc(), given.id.desc()).limit(1).correlate(User).scalar_subquery()
+        return db.session.query(latest_id).filter(User.manager_id == manager_id)
+    
+    @staticmethod
+    def tag_stats(owner_column, user_id):
+        """
+        Per-tag totals and sentiment breakdown for the feedback given or received
+        by a user, from a single grouped query
+        """
+        rows = db.session.query(
+            Tag.name, Feedback.sentiment, func.count(Feedback.id)
+        ).join(feedback_tags, feedback_tags.c.tag_id == Tag.id).join(
+            Feedback, Feedback.id == feedback_tags.c.feedback_id
+        ).filter(owner_column == user_id).group_by(Tag.name, Feedback.sentiment).all()
+        
+        stats = {}
+        for name, sentiment, count in rows:
+            entry = stats.setdefault(name, {
+                'name': name,
+                'count': 0,
+                'sentiment': {'positive': 0, 'neutral': 0, 'negative': 0}
+            })
+            entry['count'] += count
+            entry['sentiment'][sentiment] = count
+        return sorted(stats.values(), key=lambda entry: (-entry['count'], entry['name']))
+    
+    @staticmethod
+    def to_dict_list(feedback_list):
+        """
+        Serialize many feedback rows (entities, or rows of list_columns()) with
+        a fixed number of queries
+        """
+        if not feedback_list:
+            return []
+        
+        feedback_ids = [f.id for f in feedback_list]
+        user_ids = {f.manager_id for f in feedback_list} | {f.employee_id for f in feedback_list}
+        
+        # One join for the tags of every row
+        tag_names = {}
+        tag_rows = db.session.query(feedback_tags.c.feedback_id, Tag.name).join(
+            Tag, Tag.id == feedback_tags.c.tag_id
+        ).filter(feedback_tags.c.feedback_id.in_(feedback_ids)).order_by(Tag.name).all()
+        for feedback_id, name in tag_rows:
+            tag_names.setdefault(feedback_id, []).append(name)
+        # One (cached) identity lookup for every manager/employee name on the page
+        user_names = {user_id: user['name'] for user_id, user in _users_by_id(user_ids).items()}
+        
+        return [
+            Feedback.serialize(f, user_names, tag_names.get(f.id, []))
+            for f in feedback_list
+        ]
+
+class FeedbackStats(db.Model):
+    """
+    Maintained totals of the feedback given (side='manager') and received
+    (side='employee') by each user, so dashboards read one row instead of
+    aggregating. Every feedback write adjusts them in its own transaction;
+    `flask reconcile-counters` repairs drift.
+    """
+    __tablename__ = 'feedback_stats'
+    
+    user_id = db.Column(db.Integer, primary_key=True)
+    side = db.Column(db.String(10), primary_key=True)  # 'manager' or 'employee'
+    total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    acknowledged = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    positive = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    neutral = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    negative = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    COUNTERS = ('total', 'acknowledged', 'positive', 'neutral', 'negative')
+    SIDES = ('manager', 'employee')
+    
+    @staticmethod
+    def adjust(removed=(), added=()):
+        """
+        Apply the change from the removed to the added feedback states (tuples
+        from Feedback.counted_state()) with one upsert per affected user and
+        side, each an atomic counter = counter + delta. The caller commits.
+        """
+        deltas = {}
+        for sign, states in ((-1, removed), (1, added)):
+            for manager_id, employee_id, sentiment, acknowledged in states:
+                for key in ((manager_id, 'manager'), (employee_id, 'employee')):
+                    counters = deltas.setdefault(key, dict.fromkeys(FeedbackStats.COUNTERS, 0))
+                    counters['total'] += sign
+                    counters[sentiment] += sign
+                    if acknowledged:
+                        counters['acknowledged'] += sign
+        
+        rows = [
+            {'user_id': user_id, 'side': side, **counters}
+            for (user_id, side), counters in deltas.items() if any(counters.values())
+        ]
+        if not rows:
+            return
+        insert_stmt = _insert_for_dialect(FeedbackStats)
+        db.session.execute(insert_stmt.on_conflict_do_update(
+            index_elements=['user_id', 'side'],
+            set_={name: getattr(FeedbackStats, name) + insert_stmt.excluded[name] for name in FeedbackStats.COUNTERS}
+        ), rows)
+    
+    @staticmethod
+    def summary(user_id, side):
+        """Dashboard totals for the feedback given ('manager') or received ('employee') by a user"""
+        row = db.session.get(FeedbackStats, (user_id, side))
+        return {
+            'total': row.total if row else 0,
+            'acknowledged': row.acknowledged if row else 0,
+            'sentiment': {
+                sentiment: getattr(row, sentiment) if row else 0
+                for sentiment in ('positive', 'neutral', 'negative')
+            }
+        }
+    
+    @staticmethod
+    def by_employee(manager_id, employee_ids):
+        """
+        summary()-shaped totals of the feedback a manager gave to each of
+        employee_ids (zeros for those with none), from one grouped query
+        """
+        totals = {
+            employee_id: {'total': 0, 'acknowledged': 0, 'sentiment': {'positive': 0, 'neutral': 0, 'negative': 0}}
+            for employee_id in employee_ids
+        }
+        for employee_id, sentiment, acknowledged, count in db.session.query(
+            Feedback.employee_id, Feedback.sentiment, Feedback.acknowledged, func.count(Feedback.id)
+        ).filter(Feedback.manager_id == manager_id).group_by(
+            Feedback.employee_id, Feedback.sentiment, Feedback.acknowledged
+        ):
+            entry = totals.get(employee_id)
+            if entry is None:
+                continue
+            entry['total'] += count
+            entry['sentiment'][sentiment] += count
+            if acknowledged:
+                entry['acknowledged'] += count
+        return totals
+    
+    @staticmethod
+    def reconcile():
+        """
+        Recompute every user's totals from the feedback table and rewrite the
+        rows that drifted (dropping rows for users with no feedback left);
+        returns the number of rows repaired. The caller commits.
+        """
+        acknowledged = db.case((Feedback.acknowledged.is_(True), 1), else_=0)
+        expected = {}
+        for side in FeedbackStats.SIDES:
+            owner_column = getattr(Feedback, f'{side}_id')
+            rows = db.session.query(
+                owner_column,
+                func.count(Feedback.id),
+                func.sum(acknowledged),
+                *[func.sum(db.case((Feedback.sentiment == sentiment, 1), else_=0))
+                  for sentiment in ('positive', 'neutral', 'negative')]
+            ).group_by(owner_column).all()
+            for user_id, *counters in rows:
+                expected[(user_id, side)] = tuple(int(value or 0) for value in counters)
+        
+        stored = {
+            (row.user_id, row.side): tuple(getattr(row, name) for name in FeedbackStats.COUNTERS)
+            for row in db.session.query(FeedbackStats.user_id, FeedbackStats.side, *[
+                getattr(FeedbackStats, name) for name in FeedbackStats.COUNTERS
+            ])
+        }
+        
+        drifted = [key for key, counters in expected.items() if stored.get(key) != counters]
+        stale = [key for key in stored if key not in expected]
+        if drifted:
+            insert_stmt = _insert_for_dialect(FeedbackStats)
+            db.session.execute(insert_stmt.on_conflict_do_update(
+                index_elements=['user_id', 'side'],
+                set_={name: insert_stmt.excluded[name] for name in FeedbackStats.COUNTERS}
+            ), [
+                {'user_id': user_id, 'side': side, **dict(zip(FeedbackStats.COUNTERS, expected[(user_id, side)]))}
+                for user_id, side in drifted
+            ])
+        for user_id, side in stale:
+            db.session.execute(
+                delete(FeedbackStats).where(FeedbackStats.user_id == user_id, FeedbackStats.side == side)
+            )
+        return len(drifted) + len(stale)
 
 class FeedbackComment(db.Model):
     __tablename__ = 'feedback_comments'
+    __table_args__ = (
+        db.Index('ix_feedback_comments_thread', 'feedback_id', 'parent_id', 'created_at'),
+        db.Index('ix_feedback_comments_parent_id', 'parent_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     feedback_id = db.Column(db.Integer, db.ForeignKey('feedback.id'), nullable=False)
-    user_id = db.Column(db.Integer, nullable=False)  # Use hardcoded user IDs
+    user_id = db.Column(db.Integer, nullable=False)
     comment_text = db.Column(db.Text, nullable=False)
     parent_id = db.Column(db.Integer, db.ForeignKey('feedback_comments.id'), nullable=True)  # For replies
-    likes = db.Column(db.Integer, default=0)
-    liked_by_users = db.Column(db.Text, nullable=True)  # Comma-separated user IDs who liked this comment
+    likes = db.Column(db.Integer, default=0)  # Kept in sync with comment_likes
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Self-referential relationship for replies
     replies = db.relationship('FeedbackComment', backref=db.backref('parent', remote_side=[id]), lazy=True)
+    like_records = db.relationship('CommentLike', backref='comment', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self, current_user_id=None):
-        # Map hardcoded user IDs to names
-        user_names = {
-            1: "John Manager",
-            2: "Jane Employee", 
-            3: "Bob Employee"
-        }
-        user_roles = {
-            1: "manager",
-            2: "employee",
-            3: "employee"
-        }
-        
-        # Check if current user liked this comment
-        liked_by_user = False
-        if current_user_id and self.liked_by_users:
-            liked_user_ids = [int(uid.strip()) for uid in self.liked_by_users.split(',') if uid.strip()]
-            liked_by_user = current_user_id in liked_user_ids
-        
+    @staticmethod
+    def tree_columns():
+        """Columns the comment serializer reads, for projected (entity-free) queries"""
+        return (
+            FeedbackComment.id, FeedbackComment.feedback_id, FeedbackComment.user_id, FeedbackComment.comment_text,
+            FeedbackComment.parent_id, FeedbackComment.likes, FeedbackComment.created_at, FeedbackComment.updated_at
+        )
+    
+    @staticmethod
+    def serialize(row, users, liked_by_user, replies):
+        """API dict for a FeedbackComment or a row of tree_columns(); datetimes stay native"""
+        author = users.get(row.user_id)
         return {
-            'id': self.id,
-            'feedback_id': self.feedback_id,
-            'user_id': self.user_id,
-            'user_name': user_names.get(self.user_id, 'Unknown User'),
-            'user_role': user_roles.get(self.user_id, 'unknown'),
-            'comment_text': self.comment_text,
-            'parent_id': self.parent_id,
-            'likes': self.likes,
+            'id': row.id,
+            'feedback_id': row.feedback_id,
+            'user_id': row.user_id,
+            'user_name': author['name'] if author else 'Unknown User',
+            'user_role': author['role'] if author else 'unknown',
+            'comment_text': row.comment_text,
+            'parent_id': row.parent_id,
+            'likes': row.likes or 0,
             'liked_by_user': liked_by_user,
-            'replies': [reply.to_dict(current_user_id) for reply in self.replies] if self.replies else [],
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'replies': replies,
+            'created_at': row.created_at,
+            'updated_at': row.updated_at
         }
     
-    def add_like(self, user_id):
-        """Add a like from a user"""
-        if not self.liked_by_users:
-            self.liked_by_users = str(user_id)
+    def to_dict(self, current_user_id=None, include_replies=True, liked_by_user=None, users=None):
+        # Callers serializing many comments pass one batch-resolved {id: identity} map
+        if users is None:
+            users = _users_by_id([self.user_id])
+        
+        # Check if current user liked this comment (callers serializing a page pass it in)
+        if liked_by_user is None:
+            liked_by_user = bool(current_user_id) and self.is_liked_by(current_user_id)
+        
+        # The reply subtree goes through load_tree: a fixed number of queries and one
+        # batched identity lookup covering every reply author
+        replies = FeedbackComment.load_tree(self.feedback_id, current_user_id, root_id=self.id) if include_replies else []
+        return FeedbackComment.serialize(self, users, liked_by_user, replies)
+    
+    @staticmethod
+    def thread_version(feedback_id):
+        """Change validator for one feedback's comments (edits and likes bump updated_at)"""
+        return tuple(db.session.query(
+            func.count(FeedbackComment.id), func.max(FeedbackComment.updated_at)
+        ).filter(FeedbackComment.feedback_id == feedback_id).one())
+    
+    @staticmethod
+    def thread_roots(feedback_id, parent_id=None, after=None, limit=None):
+        """
+        Top-level comments of a feedback (or the replies of parent_id), oldest
+        first. Paged in SQL: after is a (created_at, id) keyset position.
+        """
+        query = db.session.query(*FeedbackComment.tree_columns()).filter(
+            FeedbackComment.feedback_id == feedback_id,
+            FeedbackComment.parent_id.is_(None) if parent_id is None else FeedbackComment.parent_id == parent_id
+        )
+        if after:
+            after_created, after_id = after
+            query = query.filter(or_(
+                FeedbackComment.created_at > after_created,
+                and_(FeedbackComment.created_at == after_created, FeedbackComment.id > after_id)
+            ))
+        query = query.order_by(FeedbackComment.created_at.asc(), FeedbackComment.id.asc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    @staticmethod
+    def descendants_statement(depth_limited):
+        """
+        Recursive query for every reply below a set of comments (:root_ids),
+        optionally stopping at :max_depth. Built once per shape and reused, so
+        requests only bind parameters.
+        """
+        statement = _DESCENDANT_STATEMENTS.get(depth_limited)
+        if statement is None:
+            thread = select(FeedbackComment.id, literal(1).label('depth')).where(
+                FeedbackComment.parent_id.in_(bindparam('root_ids', expanding=True))
+            ).cte('thread', recursive=True)
+            reply = aliased(FeedbackComment)
+            step = select(reply.id, thread.c.depth + 1).where(reply.parent_id == thread.c.id)
+            if depth_limited:
+                step = step.where(thread.c.depth < bindparam('max_depth'))
+            thread = thread.union_all(step)
+            statement = select(*FeedbackComment.tree_columns(), thread.c.depth).join(
+                thread, thread.c.id == FeedbackComment.id
+            ).order_by(FeedbackComment.created_at.asc(), FeedbackComment.id.asc())
+            _DESCENDANT_STATEMENTS[depth_limited] = statement
+        return statement
+    
+    @staticmethod
+    def load_tree(feedback_id, current_user_id=None, max_depth=None, root_id=None, roots=None):
+        """
+        Load the top-level comments of a feedback (or the replies of root_id, or
+        the given thread_roots rows) with their replies nested in memory.
+        A whole thread is one flat ordered query over the feedback's comments.
+        Paged or depth-limited calls load only the descendants of their roots
+        through a recursive query that stops at max_depth; nodes at that depth
+        report their hidden replies only through 'replies_count'.
+        """
+        # Plain column rows: no identity map or change tracking for a read-only tree
+        if roots is None and max_depth is None:
+            comments = db.session.query(*FeedbackComment.tree_columns()).filter(
+                FeedbackComment.feedback_id == feedback_id
+            ).order_by(FeedbackComment.created_at.asc(), FeedbackComment.id.asc()).all()
+            root_ids = [c.id for c in comments if c.parent_id == root_id]
+            descendants = [c for c in comments if c.parent_id != root_id]
         else:
-            liked_user_ids = [int(uid.strip()) for uid in self.liked_by_users.split(',') if uid.strip()]
-            if user_id not in liked_user_ids:
-                liked_user_ids.append(user_id)
-                self.liked_by_users = ','.join(map(str, liked_user_ids))
-        self.likes = len([uid for uid in self.liked_by_users.split(',') if uid.strip()])
+            if roots is None:
+                roots = FeedbackComment.thread_roots(feedback_id, root_id)
+            root_ids = [root.id for root in roots]
+            descendants = []
+            if root_ids and (max_depth is None or max_depth > 0):
+                descendants = db.session.execute(
+                    FeedbackComment.descendants_statement(max_depth is not None),
+                    {'root_ids': root_ids, 'max_depth': max_depth}
+                ).all()
+            comments = list(roots) + descendants
+        if not root_ids:
+            return []
+        
+        liked_ids = CommentLike.liked_comment_ids(current_user_id, [c.id for c in comments])
+        users = _users_by_id({c.user_id for c in comments})
+        
+        nodes = {}
+        for comment in comments:
+            node = FeedbackComment.serialize(comment, users, comment.id in liked_ids, [])
+            node['replies_count'] = 0
+            nodes[comment.id] = node
+        
+        for comment in descendants:
+            parent = nodes.get(comment.parent_id)
+            if parent is not None:
+                parent['replies'].append(nodes[comment.id])
+                parent['replies_count'] += 1
+        
+        if max_depth is not None:
+            # The deepest loaded level only gets its reply counts
+            edge_ids = [c.id for c in descendants if c.depth == max_depth] if max_depth else root_ids
+            if edge_ids:
+                for parent_id, count in db.session.query(
+                    FeedbackComment.parent_id, func.count(FeedbackComment.id)
+                ).filter(FeedbackComment.parent_id.in_(edge_ids)).group_by(FeedbackComment.parent_id):
+                    nodes[parent_id]['replies_count'] = count
+        
+        return [nodes[root_id] for root_id in root_ids]
+    
+    @staticmethod
+    def reconcile_likes():
+        """Recount likes from comment_likes where it drifted; returns the number of rows repaired"""
+        actual = db.session.query(func.count(CommentLike.id)).filter(
+            CommentLike.comment_id == FeedbackComment.id
+        ).scalar_subquery()
+        result = db.session.execute(
+            update(FeedbackComment)
+            .where(func.coalesce(FeedbackComment.likes, 0) != actual)
+            .values(likes=actual, updated_at=FeedbackComment.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    def is_liked_by(self, user_id):
+        """Check whether a user has liked this comment"""
+        return db.session.query(
+            CommentLike.query.filter_by(comment_id=self.id, user_id=user_id).exists()
+        ).scalar()
+    
+    def add_like(self, user_id):
+        """Add a like from a user; returns False if the user had already liked it"""
+        insert_stmt = _insert_for_dialect(CommentLike).values(comment_id=self.id, user_id=user_id)
+        result = db.session.execute(insert_stmt.on_conflict_do_nothing(index_elements=['comment_id', 'user_id']))
+        if not result.rowcount:
+            return False
+        db.session.execute(
+            update(FeedbackComment)
+            .where(FeedbackComment.id == self.id)
+            .values(likes=func.coalesce(FeedbackComment.likes, 0) + 1)
+        )
+        return True
     
     def remove_like(self, user_id):
-        """Remove a like from a user"""
-        if self.liked_by_users:
-            liked_user_ids = [int(uid.strip()) for uid in self.liked_by_users.split(',') if uid.strip()]
-            if user_id in liked_user_ids:
-                liked_user_ids.remove(user_id)
-                self.liked_by_users = ','.join(map(str, liked_user_ids)) if liked_user_ids else None
-        self.likes = len([uid for uid in self.liked_by_users.split(',') if uid.strip()]) if self.liked_by_users else 0
+        """Remove a like from a user; returns False if the user had not liked it"""
+        result = db.session.execute(
+            delete(CommentLike).where(CommentLike.comment_id == self.id, CommentLike.user_id == user_id)
+        )
+        if not result.rowcount:
+            return False
+        db.session.execute(
+            update(FeedbackComment)
+            .where(FeedbackComment.id == self.id)
+            .values(likes=func.coalesce(FeedbackComment.likes, 0) - 1)
+        )
+        return True
+
+class CommentLike(db.Model):
+    __tablename__ = 'comment_likes'
+    __table_args__ = (
+        db.UniqueConstraint('comment_id', 'user_id', name='uq_comment_likes_comment_user'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    comment_id = db.Column(db.Integer, db.ForeignKey('feedback_comments.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @staticmethod
+    def liked_comment_ids(user_id, comment_ids):
+        """Return the subset of comment_ids liked by user_id, in one query"""
+        if not user_id or not comment_ids:
+            return set()
+        rows = db.session.query(CommentLike.comment_id).filter(
+            CommentLike.user_id == user_id,
+            CommentLike.comment_id.in_(comment_ids)
+        ).all()
+        return {row[0] for row in rows}
+
+def _insert_for_dialect(model):
+    """INSERT construct supporting ON CONFLICT for the active database"""
+    if db.engine.dialect.name == 'postgresql':
+        return pg_insert(model)
+    return sqlite_insert(model)
 
 class FeedbackRequest(db.Model):
     __tablename__ = 'feedback_requests'
+    __table_args__ = (
+        db.Index('ix_feedback_requests_manager_created', 'manager_id', 'created_at'),
+        db.Index('ix_feedback_requests_employee_status', 'employee_id', 'status', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    employee_id = db.Column(db.Integer, nullable=False)  # Use hardcoded user IDs
-    manager_id = db.Column(db.Integer, nullable=False)   # Use hardcoded user IDs
+    employee_id = db.Column(db.Integer, nullable=False)
+    manager_id = db.Column(db.Integer, nullable=False)
     message = db.Column(db.Text, nullable=True)          # Optional message from employee
     status = db.Column(db.String(20), default='pending') # 'pending', 'completed', 'declined'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        # Map hardcoded user IDs to names
-        user_names = {
-            1: "John Manager",
-            2: "Jane Employee", 
-            3: "Bob Employee"
+    LIST_FIELDS = (
+        'id', 'employee_id', 'manager_id', 'employee_name', 'manager_name', 'message', 'status',
+        'created_at', 'completed_at'
+    )
+    TEXT_FIELDS = ('message',)
+    
+    @staticmethod
+    def list_columns():
+        """Columns the serializer reads, for projected (entity-free) queries"""
+        return (
+            FeedbackRequest.id, FeedbackRequest.employee_id, FeedbackRequest.manager_id, FeedbackRequest.message,
+            FeedbackRequest.status, FeedbackRequest.created_at, FeedbackRequest.completed_at
+        )
+    
+    @staticmethod
+    def serialize(row, users):
+        """API dict for a FeedbackRequest or a row of list_columns(); datetimes stay native"""
+        employee = users.get(row.employee_id)
+        manager = users.get(row.manager_id)
+        return {
+            'id': row.id,
+            'employee_id': row.employee_id,
+            'manager_id': row.manager_id,
+            'employee_name': employee['name'] if employee else 'Unknown Employee',
+            'manager_name': manager['name'] if manager else 'Unknown Manager',
+            'message': row.message,
+            'status': row.status,
+            'created_at': row.created_at,
+            'completed_at': row.completed_at
         }
-        
+    
+    def to_dict(self, users=None):
+        if users is None:
+            users = _users_by_id([self.employee_id, self.manager_id])
+        return FeedbackRequest.serialize(self, users)
+    
+    @staticmethod
+    def scope_version(owner_column, user_id):
+        """Change validator for the requests sent (employee_id) or received (manager_id) by a user"""
+        return tuple(db.session.query(
+            func.count(FeedbackRequest.id), func.max(FeedbackRequest.updated_at)
+        ).filter(owner_column == user_id).one())
+    
+    @staticmethod
+    def to_dict_list(requests):
+        """Serialize many requests (entities, or rows of list_columns()) with one identity lookup for all names"""
+        users = _users_by_id({r.employee_id for r in requests} | {r.manager_id for r in requests})
+        return [FeedbackRequest.serialize(r, users) for r in requests]
+
+class NotificationOutbox(db.Model):
+    __tablename__ = 'notification_outbox'
+    __table_args__ = (
+        # Dispatcher polls: WHERE status = 'pending' AND next_attempt_at <= now ORDER BY id
+        db.Index('ix_notification_outbox_due', 'status', 'next_attempt_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # 'pending', 'sent', 'failed'
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+class ExportJob(db.Model):
+    __tablename__ = 'export_jobs'
+    __table_args__ = (
+        db.Index('ix_export_jobs_owner_created', 'owner_id', 'created_at'),
+    )
+    
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    owner_id = db.Column(db.Integer, nullable=False)
+    format = db.Column(db.String(10), nullable=False)  # 'zip' or 'pdf'
+    status = db.Column(db.String(20), nullable=False, default='queued')  # 'queued', 'running', 'completed', 'failed'
+    item_count = db.Column(db.Integer, nullable=False, default=0)
+    file_path = db.Column(db.String(500), nullable=True)
+    error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
         return {
             'id': self.id,
-            'employee_id': self.employee_id,
-            'manager_id': self.manager_id,
-            'employee_name': user_names.get(self.employee_id, 'Unknown Employee'),
-            'manager_name': user_names.get(self.manager_id, 'Unknown Manager'),
-            'message': self.message,
+            'format': self.format,
             'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None
-        } 
\ No newline at end of file
+            'item_count': self.item_count,
+            'error': self.error,
+            'created_at': self.created_at,
+            'completed_at': self.completed_at
+        }
@@ -0,0 +1,140 @@
+import logging
+import smtplib
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from flask import current_app
+from models import db, NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+def enqueue_notification(to_email, subject, body):
+    """
+    Queue an email in the outbox as part of the caller's transaction.
+    Nothing is sent here; the dispatcher worker delivers it after commit.
+    """
+    notification = NotificationOutbox(
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.session.add(notification)
+    return notification
+
+def send_notification_email(to_email, subject, body, smtp=None):
+    """
+    Deliver a single email. Uses the given SMTP connection when one is
+    configured (SMTP_HOST), otherwise only logs the message like the demo did.
+    Raises on delivery failure so the dispatcher can schedule a retry.
+    """
+    if smtp is None:
+        logger.info(f"📧 EMAIL NOTIFICATION:")
+        logger.info(f"To: {to_email}")
+        logger.info(f"Subject: {subject}")
+        logger.info(f"Body: {body}")
+        logger.info("---")
+        return
+    
+    message = EmailMessage()
+    message['From'] = current_app.config['MAIL_FROM']
+    message['To'] = to_email
+    message['Subject'] = subject
+    message.set_content(body, subtype='html')
+    smtp.send_message(message)
+
+def _open_smtp():
+    """Open one SMTP connection for a whole batch, or None in log-only mode"""
+    config = current_app.config
+    if not config.get('SMTP_HOST'):
+        return None
+    smtp = smtplib.SMTP(config['SMTP_HOST'], config['SMTP_PORT'], timeout=config['SMTP_TIMEOUT'])
+    if config.get('SMTP_USE_TLS'):
+        smtp.starttls()
+    if config.get('SMTP_USERNAME'):
+        smtp.login(config['SMTP_USERNAME'], config['SMTP_PASSWORD'])
+    return smtp
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2*base, 4*base, ... capped at NOTIFICATION_BACKOFF_MAX"""
+    config = current_app.config
+    delay = config['NOTIFICATION_BACKOFF_BASE'] * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, config['NOTIFICATION_BACKOFF_MAX']))
+
+def dispatch_pending(batch_size=None):
+    """
+    Claim one batch of due outbox rows, deliver them over a single SMTP
+    connection and record the outcome. Returns the number of rows processed.
+    """
+    config = current_app.config
+    batch_size = batch_size or config['NOTIFICATION_BATCH_SIZE']
+    now = datetime.utcnow()
+    
+    # SKIP LOCKED lets several dispatchers share the outbox on Postgres
+    batch = NotificationOutbox.query.filter(
+        NotificationOutbox.status == 'pending',
+        NotificationOutbox.next_attempt_at <= now
+    ).order_by(NotificationOutbox.id).limit(batch_size).with_for_update(skip_locked=True).all()
+    
+    if not batch:
+        db.session.rollback()
+        return 0
+    
+    smtp = None
+    try:
+        smtp = _open_smtp()
+    except Exception as e:
+        # Connection-level failure: every row in the batch is retried later
+        logger.error(f"Failed to connect to SMTP server: {str(e)}")
+        for notification in batch:
+            _record_failure(notification, e, now)
+        db.session.commit()
+        return len(batch)
+    
+    try:
+        for notification in batch:
+            try:
+                send_notification_email(notification.to_email, notification.subject, notification.body, smtp=smtp)
+                notification.status = 'sent'
+                notification.sent_at = datetime.utcnow()
+                notification.attempts += 1
+                notification.last_error = None
+            except Exception as e:
+                logger.error(f"Failed to send email notification {notification.id}: {str(e)}")
+                _record_failure(notification, e, now)
+    finally:
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                pass
+    
+    db.session.commit()
+    return len(batch)
+
+def _record_failure(notification, error, now):
+    notification.attempts += 1
+    notification.last_error = str(error)[:500]
+    if notification.attempts >= current_app.config['NOTIFICATION_MAX_ATTEMPTS']:
+        notification.status = 'failed'
+    else:
+        notification.next_attempt_at = now + retry_delay(notification.attempts)
+
+def run_dispatcher(poll_interval=None, once=False):
+    """
+    Drain the outbox until stopped, sleeping only when nothing is due.
+    With once=True, return as soon as no due rows remain.
+    """
+    poll_interval = poll_interval or current_app.config['NOTIFICATION_POLL_INTERVAL']
+    logger.info("Notification dispatcher started")
+    while True:
+        try:
+            processed = dispatch_pending()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Notification dispatch failed: {str(e)}")
+            processed = 0
+        if not processed:
+            if once:
+                return
+            time.sleep(poll_interval)
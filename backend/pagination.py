@@ -0,0 +1,83 @@
+import base64
+from datetime import datetime, time
+from sqlalchemy import or_, and_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse a ?limit= query value, clamping it to [1, maximum]"""
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (ValueError, TypeError):
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return min(limit, maximum)
+
+def encode_cursor(created_at, row_id):
+    """Encode a (created_at, id) keyset position as an opaque cursor string"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor back into (created_at, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, row_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def parse_bool(value, name):
+    """Parse a boolean query parameter ('true'/'false'/'1'/'0')"""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f'{name} must be true or false')
+    lowered = value.lower()
+    if lowered in ('true', '1', 'yes'):
+        return True
+    if lowered in ('false', '0', 'no'):
+        return False
+    raise ValueError(f'{name} must be true or false')
+
+def parse_date(value, name, end_of_day=False):
+    """
+    Parse an ISO date/datetime query parameter. With end_of_day a bare date
+    (no time part) means the last instant of that day, so an inclusive upper
+    bound keeps the whole day.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise ValueError(f'{name} must be an ISO date')
+    if end_of_day and len(value) == len('YYYY-MM-DD'):
+        parsed = datetime.combine(parsed.date(), time.max)
+    return parsed
+
+def keyset_page(query, created_col, id_col, cursor, limit):
+    """
+    Apply newest-first keyset pagination on (created_at, id) to a query.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        cursor_created, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            created_col < cursor_created,
+            and_(created_col == cursor_created, id_col < cursor_id)
+        ))
+
+    rows = query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
@@ -0,0 +1,159 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing executor has no free slot, or a check outlives PASSWORD_HASH_TIMEOUT"""
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+_dummy_hashes = {}
+
+MAX_TRACKED_ACCOUNTS = 10000
+
+def canonical_method(method):
+    """
+    Expand a Werkzeug method string to the form stored in hashes, e.g.
+    'pbkdf2' -> 'pbkdf2:sha256:600000' and 'scrypt' -> 'scrypt:32768:8:1'
+    """
+    name, *args = method.split(':')
+    if name == 'pbkdf2':
+        digest = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{digest}:{iterations}"
+    if name == 'scrypt':
+        n, r, p = (args + ['32768', '8', '1'][len(args):])[:3]
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    return method
+
+def hash_password(password):
+    """Hash with the configured PASSWORD_HASH_METHOD and PASSWORD_SALT_LENGTH"""
+    config = current_app.config
+    return generate_password_hash(
+        password,
+        method=config['PASSWORD_HASH_METHOD'],
+        salt_length=config['PASSWORD_SALT_LENGTH']
+    )
+
+def needs_rehash(password_hash):
+    """True when a stored hash was made with different parameters than configured"""
+    method = password_hash.split('$', 1)[0]
+    return method != canonical_method(current_app.config['PASSWORD_HASH_METHOD'])
+
+def get_hash_executor():
+    """
+    Threads shared by all password checks of this worker. PBKDF2 and scrypt
+    release the GIL, so checks run in parallel while in-flight work is capped
+    at PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE.
+    """
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            config = current_app.config
+            _executor = ThreadPoolExecutor(
+                max_workers=config['PASSWORD_HASH_WORKERS'],
+                thread_name_prefix='password-hash'
+            )
+            _slots = threading.BoundedSemaphore(config['PASSWORD_HASH_WORKERS'] + config['PASSWORD_HASH_QUEUE'])
+        return _executor
+
+def _run_bounded(fn, *args):
+    """
+    Run fn on the hashing executor and wait for its result. This bounds how
+    many hashes run at once; it does not free the request thread, which still
+    blocks until the hash finishes or PASSWORD_HASH_TIMEOUT passes.
+    """
+    executor = get_hash_executor()
+    if not _slots.acquire(blocking=False):
+        raise PasswordHasherBusy('Too many password checks in progress')
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=current_app.config['PASSWORD_HASH_TIMEOUT'])
+    except FutureTimeout:
+        # A check still waiting for a thread is dropped; one already running finishes and frees its slot then
+        future.cancel()
+        raise PasswordHasherBusy('Password check timed out')
+
+def _dummy_hash():
+    """Hash checked for unknown accounts, so they cost as much as real ones"""
+    method = canonical_method(current_app.config['PASSWORD_HASH_METHOD'])
+    if method not in _dummy_hashes:
+        _dummy_hashes[method] = hash_password('not-a-real-password')
+    return _dummy_hashes[method]
+
+def verify_password(password_hash, password):
+    """Check a password on the hashing executor; raises PasswordHasherBusy when saturated"""
+    if not password_hash:
+        _run_bounded(check_password_hash, _dummy_hash(), password)
+        return False
+    return _run_bounded(check_password_hash, password_hash, password)
+
+def rehash_password(password):
+    """hash_password on the hashing executor"""
+    config = current_app.config
+    return _run_bounded(
+        generate_password_hash, password, config['PASSWORD_HASH_METHOD'], config['PASSWORD_SALT_LENGTH']
+    )
+
+class LoginRateLimiter:
+    """
+    Per-account limit on failed logins: after max_failures within window
+    seconds the account is locked until the oldest failure leaves the window.
+    In memory, per worker process.
+    """
+    
+    def __init__(self, max_failures, window):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures = {}
+        self._lock = threading.Lock()
+    
+    def _recent(self, key, now):
+        failures = [at for at in self._failures.get(key, []) if at > now - self.window]
+        if failures:
+            self._failures[key] = failures
+        else:
+            self._failures.pop(key, None)
+        return failures
+    
+    def retry_after(self, key):
+        """Seconds until the account may try again, or 0 if it is not locked"""
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(key, now)
+            if len(failures) < self.max_failures:
+                return 0
+            return max(int(failures[-self.max_failures] + self.window - now) + 1, 1)
+    
+    def record_failure(self, key):
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(key, now)
+            failures.append(now)
+            self._failures[key] = failures[-self.max_failures:]
+            # Sweep accounts nobody has retried so guessing many emails can't grow this forever
+            if len(self._failures) > MAX_TRACKED_ACCOUNTS:
+                for stale in [k for k, times in self._failures.items() if times[-1] <= now - self.window]:
+                    del self._failures[stale]
+    
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+def get_login_limiter():
+    """Per-app login limiter, created on first use from LOGIN_RATE_LIMIT_* config"""
+    limiter = current_app.extensions.get('login_limiter')
+    if limiter is None:
+        limiter = current_app.extensions.setdefault('login_limiter', LoginRateLimiter(
+            current_app.config['LOGIN_RATE_LIMIT_FAILURES'],
+            current_app.config['LOGIN_RATE_LIMIT_WINDOW']
+        ))
+    return limiter
@@ -0,0 +1,218 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from io import BytesIO
+from flask import current_app
+from sqlalchemy import func
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from models import db, FeedbackComment
+from identity import get_users
+
+# Styles are immutable once built, so they are created once per process
+_styles = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_styles['Heading1'],
+    fontSize=18,
+    spaceAfter=30,
+    textColor=colors.HexColor('#1f2937')
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_styles['Heading2'],
+    fontSize=14,
+    spaceAfter=12,
+    textColor=colors.HexColor('#374151')
+)
+
+NORMAL_STYLE = _styles['Normal']
+
+DETAILS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+DATE_FORMAT = '%B %d, %Y at %I:%M %p'
+
+class PdfCache:
+    """Thread-safe LRU cache of rendered PDFs bounded by entry count and total bytes"""
+    
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            pdf_data = self._entries.get(key)
+            if pdf_data is not None:
+                self._entries.move_to_end(key)
+            return pdf_data
+    
+    def put(self, key, pdf_data):
+        if len(pdf_data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous)
+            self._entries[key] = pdf_data
+            self.total_bytes += len(pdf_data)
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def __len__(self):
+        return len(self._entries)
+
+def get_pdf_cache():
+    """Per-app PDF cache, created on first use from PDF_CACHE_* config"""
+    cache = current_app.extensions.get('pdf_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('pdf_cache', PdfCache(
+            current_app.config['PDF_CACHE_MAX_ENTRIES'],
+            current_app.config['PDF_CACHE_MAX_BYTES']
+        ))
+    return cache
+
+def cache_key(feedback):
+    """
+    Version key for a feedback report: changes whenever the feedback or any of
+    its comments is edited, added or removed. Costs one aggregate query.
+    """
+    latest_comment, comments_count = db.session.query(
+        func.max(func.coalesce(FeedbackComment.updated_at, FeedbackComment.created_at)),
+        func.count(FeedbackComment.id)
+    ).filter(FeedbackComment.feedback_id == feedback.id).one()
+    return (feedback.id, feedback.updated_at, latest_comment, comments_count)
+
+def report_snapshot(feedback, comments):
+    """
+    Plain-data copy of everything a report needs, so rendering can run outside
+    the request (and outside the process) without touching the ORM
+    """
+    users = get_users({comment.user_id for comment in comments})
+    comment_rows = []
+    for comment in comments:
+        author = comment.to_dict(include_replies=False, liked_by_user=False, users=users)
+        comment_rows.append({
+            'user_name': author['user_name'],
+            'user_role': author['user_role'],
+            'created_at': comment.created_at,
+            'comment_text': comment.comment_text
+        })
+    
+    return {
+        'feedback_id': feedback.id,
+        'manager_name': feedback.manager.name,
+        'employee_name': feedback.employee.name,
+        'created_at': feedback.created_at,
+        'sentiment': feedback.sentiment,
+        'acknowledged': feedback.acknowledged,
+        'tags': [tag.name for tag in feedback.tags],
+        'strengths': feedback.strengths,
+        'areas_to_improve': feedback.areas_to_improve,
+        'comments': comment_rows
+    }
+
+def report_elements(report):
+    """Flowables for one report snapshot"""
+    elements = [Paragraph("Feedback Report", TITLE_STYLE), Spacer(1, 12)]
+    
+    # Feedback details table
+    feedback_data = [
+        ['Manager:', report['manager_name']],
+        ['Employee:', report['employee_name']],
+        ['Date Created:', report['created_at'].strftime(DATE_FORMAT)],
+        ['Sentiment:', report['sentiment'].title()],
+        ['Status:', 'Acknowledged' if report['acknowledged'] else 'Pending'],
+    ]
+    
+    if report['tags']:
+        feedback_data.append(['Tags:', ', '.join(report['tags'])])
+    
+    feedback_table = Table(feedback_data, colWidths=[1.5*inch, 4*inch])
+    feedback_table.setStyle(DETAILS_TABLE_STYLE)
+    elements.append(feedback_table)
+    elements.append(Spacer(1, 20))
+    
+    # Strengths and areas to improve
+    elements.append(Paragraph("Strengths", HEADING_STYLE))
+    elements.append(Paragraph(report['strengths'], NORMAL_STYLE))
+    elements.append(Spacer(1, 15))
+    elements.append(Paragraph("Areas to Improve", HEADING_STYLE))
+    elements.append(Paragraph(report['areas_to_improve'], NORMAL_STYLE))
+    elements.append(Spacer(1, 20))
+    
+    # Comments section
+    if report['comments']:
+        elements.append(Paragraph("Comments & Discussion", HEADING_STYLE))
+        elements.append(Spacer(1, 10))
+        
+        for comment in report['comments']:
+            comment_header = f"<b>{comment['user_name']}</b> ({comment['user_role']}) - {comment['created_at'].strftime(DATE_FORMAT)}"
+            elements.append(Paragraph(comment_header, NORMAL_STYLE))
+            elements.append(Paragraph(comment['comment_text'], NORMAL_STYLE))
+            elements.append(Spacer(1, 10))
+    
+    return elements
+
+def render_reports_pdf(reports):
+    """Render one or more report snapshots into a single PDF, one report per page run"""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    
+    elements = []
+    for index, report in enumerate(reports):
+        if index:
+            elements.append(PageBreak())
+        elements.extend(report_elements(report))
+    
+    # Footer
+    elements.append(Spacer(1, 30))
+    elements.append(Paragraph(f"Generated on {datetime.now().strftime(DATE_FORMAT)}", NORMAL_STYLE))
+    
+    doc.build(elements)
+    return buffer.getvalue()
+
+def render_feedback_pdf(feedback, comments):
+    """Render a feedback report (with its comments, oldest first) to PDF bytes"""
+    return render_reports_pdf([report_snapshot(feedback, comments)])
+
+def get_feedback_pdf(feedback):
+    """Return the PDF bytes for a feedback, rendering only on a cache miss"""
+    cache = get_pdf_cache()
+    key = cache_key(feedback)
+    pdf_data = cache.get(key)
+    if pdf_data is None:
+        comments = FeedbackComment.query.filter_by(feedback_id=feedback.id).order_by(
+            FeedbackComment.created_at.asc(), FeedbackComment.id.asc()
+        ).all()
+        pdf_data = render_feedback_pdf(feedback, comments)
+        cache.put(key, pdf_data)
+    return pdf_data
+
+def report_filename(employee_name, created_at):
+    return f"feedback_{employee_name.replace(' ', '_')}_{created_at.strftime('%Y%m%d')}.pdf"
+
+def pdf_filename(feedback):
+    return report_filename(feedback.employee.name, feedback.created_at)
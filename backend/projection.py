@@ -0,0 +1,33 @@
+from sqlalchemy import null
+
+def parse_fields(value, available, default):
+    """
+    Parse a ?fields=a,b query value into the fields to return, in the order of
+    available. Missing or empty means default, 'all' means every available
+    field; 'id' is always included. Raises ValueError for unknown names.
+    """
+    if not value:
+        return list(default)
+    if value.strip() == 'all':
+        return list(available)
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = sorted(requested - set(available))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}; available: {', '.join(available)}")
+    requested.add('id')
+    return [name for name in available if name in requested]
+
+def projected_columns(columns, fields, omittable):
+    """
+    columns for a read-only projected query, with each omittable column that
+    fields doesn't ask for replaced by a NULL of the same name: the database
+    skips the (large) value while serializers still find every attribute
+    """
+    return [
+        null().label(column.key) if column.key in omittable and column.key not in fields else column
+        for column in columns
+    ]
+
+def only_fields(items, fields):
+    """Narrow serialized dicts to the requested fields"""
+    return [{name: item[name] for name in fields} for item in items]
@@ -1,35 +1,11 @@
 from flask import Blueprint, request, jsonify, session
 from models import db, User
+from identity import get_user
+from passwords import PasswordHasherBusy, verify_password, needs_rehash, rehash_password, get_login_limiter
+from tokens import issue_tokens, issue_access_token, current_token_user, revoke_current_token, revoke_encoded_token
 
 auth_bp = Blueprint('auth', __name__)
 
-# Hardcoded users for simplicity (matching frontend)
-HARDCODED_USERS = {
-    "manager1@company.com": {
-        "id": 1,
-        "name": "John Manager",
-        "email": "manager1@company.com",
-        "role": "manager",
-        "password": "password123"
-    },
-    "employee1@company.com": {
-        "id": 2,
-        "name": "Jane Employee",
-        "email": "employee1@company.com",
-        "role": "employee",
-        "manager_id": 1,
-        "password": "password123"
-    },
-    "employee2@company.com": {
-        "id": 3,
-        "name": "Bob Employee",
-        "email": "employee2@company.com",
-        "role": "employee",
-        "manager_id": 1,
-        "password": "password123"
-    }
-}
-
 @auth_bp.route('/login', methods=['POST'])
 def login():
     try:
@@ -40,18 +16,82 @@ def login():
         if not email or not password:
             return jsonify({'error': 'Email and password are required'}), 400
         
-        user = HARDCODED_USERS.get(email)
+        account = email.strip().lower()
+        limiter = get_login_limiter()
+        retry_after = limiter.retry_after(account)
+        if retry_after:
+            response = jsonify({'error': 'Too many failed login attempts, try again later'})
+            response.headers['Retry-After'] = str(retry_after)
+            return response, 429
+        
+        user = User.query.filter_by(email=account).first()
+        
+        try:
+            # Unknown accounts are checked against a dummy hash so they take as long
+            valid = verify_password(user.password_hash if user else None, password)
+        except PasswordHasherBusy as e:
+            return jsonify({'error': str(e)}), 503
         
-        if user and user['password'] == password:
-            # Return user without password
-            user_data = {k: v for k, v in user.items() if k != 'password'}
+        if valid:
+            limiter.reset(account)
+            
+            # Upgrade hashes made with older parameters while the plaintext is at hand
+            if needs_rehash(user.password_hash):
+                try:
+                    user.password_hash = rehash_password(password)
+                    db.session.commit()
+                except PasswordHasherBusy:
+                    pass  # upgraded on a later login
+            
+            identity = get_user(user.id)
             return jsonify({
-                'access_token': 'dummy_token',  # Frontend expects this but won't use it
-                'user': user_data
+                **issue_tokens(identity),
+                'user': identity
             }), 200
         else:
+            limiter.record_failure(account)
             return jsonify({'error': 'Invalid credentials'}), 401
             
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@auth_bp.route('/refresh', methods=['POST'])
+def refresh():
+    try:
+        token_user = current_token_user(refresh=True)
+        if not token_user:
+            return jsonify({'error': 'Valid refresh token required'}), 401
+        
+        # Re-read the user so role or team changes reach the new access token
+        user = get_user(token_user['id'])
+        if not user:
+            return jsonify({'error': 'User no longer exists'}), 401
+        
+        return jsonify({
+            'access_token': issue_access_token(user),
+            'user': user
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@auth_bp.route('/logout', methods=['POST'])
+def logout():
+    try:
+        if not current_token_user():
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        revoke_current_token()
+        
+        # Optionally revoke the refresh token as well
+        data = request.get_json(silent=True) or {}
+        refresh_token = data.get('refresh_token')
+        if refresh_token:
+            revoke_encoded_token(refresh_token)
+        
+        return jsonify({'message': 'Logged out'}), 200
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -66,9 +106,11 @@ def register():
 @auth_bp.route('/me', methods=['GET'])
 def get_current_user():
     try:
-        # For hardcoded auth, we don't need this endpoint
-        # Frontend will manage user state directly
-        return jsonify({'error': 'Not implemented in demo mode'}), 501
+        user = current_token_user()
+        if not user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        return jsonify({'user': user}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,35 @@
+from flask import Blueprint, Response, current_app, request, jsonify
+from identity import get_current_user_from_request
+from tokens import user_from_encoded_token
+from events import get_event_broker, event_stream
+
+events_bp = Blueprint('events', __name__)
+
+@events_bp.route('/', methods=['GET'], strict_slashes=False)
+def stream_events():
+    """Server-sent events for the caller: comments, likes, acknowledgements and requests"""
+    try:
+        current_user = get_current_user_from_request()
+        if not current_user and request.args.get('access_token'):
+            current_user = user_from_encoded_token(request.args['access_token'])
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        broker = get_event_broker()
+        subscription = broker.subscribe(current_user['id'])
+        if subscription is None:
+            # Every stream slot of this worker is taken; leave the threads to normal requests
+            response = jsonify({'error': 'Too many open event streams, retry later or poll'})
+            response.headers['Retry-After'] = str(int(current_app.config['EVENTS_HEARTBEAT']))
+            return response, 503
+        
+        response = Response(
+            event_stream(subscription, broker, current_app.config['EVENTS_HEARTBEAT']),
+            mimetype='text/event-stream'
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # let nginx-style proxies stream
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,68 +1,86 @@
-from flask import Blueprint, request, jsonify, send_file
-from models import db, User, Feedback, FeedbackComment, FeedbackRequest
-from sqlalchemy import or_
+from flask import Blueprint, Response, current_app, request, jsonify, send_file, stream_with_context
+from models import db, User, Feedback, FeedbackStats, FeedbackComment, FeedbackRequest, ExportJob, Tag, feedback_tags
+from sqlalchemy import func, or_
+from identity import get_current_user_from_request, get_user
+from notifications import enqueue_notification
+from events import publish_event
+from export_jobs import EXPORT_FORMATS, start_export_job, fail_if_stale
+from feedback_export import EXPORT_STREAM_FORMATS, STREAM_WRITERS, export_batches
+from pdf_renderer import get_feedback_pdf, pdf_filename
+from search import search_feedback
+from etags import compute_etag, not_modified, with_etag
+from pagination import parse_limit, parse_bool, parse_date, keyset_page, encode_cursor, decode_cursor
+from projection import parse_fields, projected_columns, only_fields
+import json
 import logging
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from io import BytesIO
 import os
 from datetime import datetime
 
 feedback_bp = Blueprint('feedback', __name__)
 
-def get_current_user_from_request():
-    """Get current user from X-User-ID header (hardcoded auth)"""
-    user_id = request.headers.get('X-User-ID')
-    if not user_id:
-        return None
-    
-    try:
-        user_id = int(user_id)
-        # Hardcoded user mapping
-        if user_id == 1:
-            return {"id": 1, "name": "John Manager", "email": "manager1@company.com", "role": "manager"}
-        elif user_id == 2:
-            return {"id": 2, "name": "Jane Employee", "email": "employee1@company.com", "role": "employee", "manager_id": 1}
-        elif user_id == 3:
-            return {"id": 3, "name": "Bob Employee", "email": "employee2@company.com", "role": "employee", "manager_id": 1}
-        else:
-            return None
-    except (ValueError, TypeError):
-        return None
+# Dashboard list sizes; full history is paged through GET /api/feedback/
+DASHBOARD_RECENT_LIMIT = 5
+DASHBOARD_TIMELINE_LIMIT = 20
 
-def send_notification_email(to_email, subject, body):
+def scope_version(current_user):
+    """Validator for everything the caller can see in listings and dashboards"""
+    owner_column = Feedback.manager_id if current_user['role'] == 'manager' else Feedback.employee_id
+    return Feedback.scope_version(owner_column, current_user['id'])
+
+def filtered_feedback_query(current_user, params):
     """
-    Simulate sending email notification
-    In production, this would integrate with SendGrid, AWS SES, or similar service
+    Feedback visible to the caller, narrowed by the optional sentiment,
+    acknowledged, tag, employee_id, date_from and date_to filters in params.
+    Raises ValueError for invalid filter values.
     """
-    try:
-        # Log the email that would be sent
-        logging.info(f"📧 EMAIL NOTIFICATION:")
-        logging.info(f"To: {to_email}")
-        logging.info(f"Subject: {subject}")
-        logging.info(f"Body: {body}")
-        logging.info("---")
-        
-        # In production, you would use a real email service:
-        # import sendgrid
-        # from sendgrid.helpers.mail import Mail
-        # 
-        # sg = sendgrid.SendGridAPIClient(api_key=os.environ.get('SENDGRID_API_KEY'))
-        # message = Mail(
-        #     from_email='noreply@company.com',
-        #     to_emails=to_email,
-        #     subject=subject,
-        #     html_content=body
-        # )
-        # response = sg.send(message)
-        
-        return True
-    except Exception as e:
-        logging.error(f"Failed to send email notification: {str(e)}")
-        return False
+    user_id = current_user['id']
+    
+    if current_user['role'] == 'manager':
+        # Managers see feedback they've given to their team
+        query = Feedback.query.filter_by(manager_id=user_id)
+    else:
+        # Employees see feedback they've received
+        query = Feedback.query.filter_by(employee_id=user_id)
+    
+    sentiment = params.get('sentiment')
+    if sentiment:
+        if sentiment not in ['positive', 'neutral', 'negative']:
+            raise ValueError('Sentiment must be positive, neutral, or negative')
+        query = query.filter(Feedback.sentiment == sentiment)
+    
+    acknowledged = params.get('acknowledged')
+    if not isinstance(acknowledged, bool):
+        acknowledged = parse_bool(acknowledged, 'acknowledged')
+    if acknowledged is not None:
+        query = query.filter(Feedback.acknowledged == acknowledged)
+    
+    tag = params.get('tag') or ''
+    if not isinstance(tag, str):
+        raise ValueError('tag must be a string')
+    tag = tag.strip()
+    if tag:
+        # Indexed lookup through feedback_tags instead of scanning tag strings
+        query = query.filter(Feedback.id.in_(
+            db.session.query(feedback_tags.c.feedback_id).join(
+                Tag, Tag.id == feedback_tags.c.tag_id
+            ).filter(Tag.name == tag)
+        ))
+    
+    employee_id = params.get('employee_id')
+    if employee_id:
+        try:
+            query = query.filter(Feedback.employee_id == int(employee_id))
+        except (ValueError, TypeError):
+            raise ValueError('employee_id must be an integer')
+    
+    date_from = parse_date(params.get('date_from'), 'date_from')
+    if date_from:
+        query = query.filter(Feedback.created_at >= date_from)
+    date_to = parse_date(params.get('date_to'), 'date_to', end_of_day=True)
+    if date_to:
+        query = query.filter(Feedback.created_at <= date_to)
+    
+    return query
 
 @feedback_bp.route('/', methods=['POST'])
 def create_feedback():
@@ -95,33 +113,123 @@ def create_feedback():
         if employee.manager_id != current_user['id']:
             return jsonify({'error': 'You can only give feedback to your team members'}), 403
         
-        # Convert tags list to comma-separated string
-        # Handle both string tags and tag objects with 'name' property
-        if tags:
-            tag_names = []
-            for tag in tags:
-                if isinstance(tag, dict) and 'name' in tag:
-                    tag_names.append(tag['name'])
-                elif isinstance(tag, str):
-                    tag_names.append(tag)
-            tags_string = ','.join(tag_names)
-        else:
-            tags_string = ''
-        
         feedback = Feedback(
             manager_id=current_user['id'],
             employee_id=employee_id,
             strengths=strengths,
             areas_to_improve=areas_to_improve,
-            sentiment=sentiment,
-            tags=tags_string
+            sentiment=sentiment
         )
+        feedback.set_tags(tags)
         
         db.session.add(feedback)
+        FeedbackStats.adjust(added=[feedback.counted_state()])
         db.session.commit()
         
         return jsonify({'feedback': feedback.to_dict()}), 201
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def bulk_feedback_items(max_items):
+    """
+    Items of a bulk create request: a JSON array (or {"items": [...]}), or
+    NDJSON with one object per line. Lines that aren't valid JSON become None
+    so they are reported per item. Raises ValueError for an unusable body.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = []
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            if len(items) >= max_items:
+                raise ValueError(f'At most {max_items} items per request')
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(None)
+        return items
+    
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of feedback items or NDJSON')
+    if len(data) > max_items:
+        raise ValueError(f'At most {max_items} items per request')
+    return data
+
+def bulk_item_error(item, team_ids):
+    """(message, status) for an item create_feedback would reject, else None"""
+    if not isinstance(item, dict):
+        return 'Item must be a JSON object', 400
+    if not all([item.get('employee_id'), item.get('strengths'), item.get('areas_to_improve'), item.get('sentiment')]):
+        return 'All fields are required', 400
+    if not isinstance(item['strengths'], str) or not isinstance(item['areas_to_improve'], str):
+        return 'strengths and areas_to_improve must be strings', 400
+    if item['sentiment'] not in ['positive', 'neutral', 'negative']:
+        return 'Sentiment must be positive, neutral, or negative', 400
+    if not isinstance(item.get('tags', []), list):
+        return 'tags must be a list', 400
+    # bool is an int subclass: true would otherwise become employee 1
+    if isinstance(item['employee_id'], bool):
+        return 'employee_id must be an integer', 400
+    try:
+        employee_id = int(item['employee_id'])
+    except (ValueError, TypeError):
+        return 'employee_id must be an integer', 400
+    if employee_id not in team_ids:
+        return 'You can only give feedback to your team members', 403
+    item['employee_id'] = employee_id
+    return None
+
+@feedback_bp.route('/bulk', methods=['POST'])
+def create_feedback_bulk():
+    """
+    Create many feedback items in one transaction (review-cycle imports).
+    Valid items are inserted and invalid ones reported; results follow the
+    request order. 201 when everything was created, 207 when some items
+    failed, 400 when none could be created.
+    """
+    try:
+        current_user = get_current_user_from_request()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
         
+        if current_user['role'] != 'manager':
+            return jsonify({'error': 'Only managers can create feedback'}), 403
+        
+        items = bulk_feedback_items(current_app.config['BULK_FEEDBACK_MAX_ITEMS'])
+        if not items:
+            return jsonify({'error': 'No feedback items'}), 400
+        
+        # One query for the whole team instead of a user lookup per item
+        team_ids = {row[0] for row in db.session.query(User.id).filter(User.manager_id == current_user['id'])}
+        
+        results = []
+        valid = []
+        for index, item in enumerate(items):
+            error = bulk_item_error(item, team_ids)
+            if error:
+                results.append({'index': index, 'status': error[1], 'error': error[0]})
+            else:
+                results.append({'index': index, 'status': 201})
+                valid.append((index, item))
+        
+        feedback_ids = Feedback.insert_many(current_user['id'], [item for _, item in valid])
+        db.session.commit()
+        for (index, _), feedback_id in zip(valid, feedback_ids):
+            results[index]['id'] = feedback_id
+        
+        failed = len(items) - len(valid)
+        status = 201 if not failed else 207 if valid else 400
+        return jsonify({'created': len(valid), 'failed': failed, 'results': results}), status
+    
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -133,19 +241,60 @@ def get_feedback():
         if not current_user:
             return jsonify({'error': 'Authentication required'}), 401
         
-        user_id = current_user['id']
+        # Answer unchanged polls before running the listing queries
+        etag = compute_etag('feedback', current_user['id'], request.query_string, scope_version(current_user))
+        cached = not_modified(etag)
+        if cached:
+            return cached
         
-        if current_user['role'] == 'manager':
-            # Managers see feedback they've given to their team
-            feedback_list = Feedback.query.filter_by(manager_id=user_id).all()
-        else:
-            # Employees see feedback they've received
-            feedback_list = Feedback.query.filter_by(employee_id=user_id).all()
+        # Server-side filters and keyset pagination
+        args = request.args
+        limit = parse_limit(args.get('limit'))
+        # Plain column rows: the listing never needs entities or change tracking
+        query = filtered_feedback_query(current_user, args).with_entities(*Feedback.list_columns())
         
-        return jsonify({
-            'feedback': [feedback.to_dict() for feedback in feedback_list]
-        }), 200
+        feedback_list, next_cursor = keyset_page(
+            query, Feedback.created_at, Feedback.id, args.get('cursor'), limit
+        )
+        
+        return with_etag(jsonify({
+            'feedback': Feedback.to_dict_list(feedback_list),
+            'next_cursor': next_cursor
+        }), etag), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@feedback_bp.route('/export', methods=['GET'])
+def export_feedback():
+    """
+    Stream the caller's whole feedback history, oldest first, as NDJSON or
+    CSV (?format=). Accepts the listing's filters; memory use does not grow
+    with the number of rows.
+    """
+    try:
+        current_user = get_current_user_from_request()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in EXPORT_STREAM_FORMATS:
+            return jsonify({'error': 'format must be ndjson or csv'}), 400
+        
+        # Filters are validated here: once streaming starts the status is sent
+        query = filtered_feedback_query(current_user, request.args)
+        body = STREAM_WRITERS[export_format](export_batches(query))
         
+        response = Response(stream_with_context(body), mimetype=EXPORT_STREAM_FORMATS[export_format])
+        filename = f"feedback_export_{datetime.utcnow().strftime('%Y%m%d')}.{export_format}"
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -158,7 +307,8 @@ def update_feedback(feedback_id):
         
         user_id = current_user['id']
         
-        feedback = Feedback.query.get(feedback_id)
+        # Row lock so the counted before/after states can't interleave with another edit
+        feedback = Feedback.query.filter_by(id=feedback_id).with_for_update().first()
         if not feedback:
             return jsonify({'error': 'Feedback not found'}), 404
         
@@ -167,6 +317,7 @@ def update_feedback(feedback_id):
             return jsonify({'error': 'You can only update your own feedback'}), 403
         
         data = request.get_json()
+        before = feedback.counted_state()
         
         if 'strengths' in data:
             feedback.strengths = data['strengths']
@@ -177,20 +328,11 @@ def update_feedback(feedback_id):
                 return jsonify({'error': 'Sentiment must be positive, neutral, or negative'}), 400
             feedback.sentiment = data['sentiment']
         if 'tags' in data:
-            # Handle both string tags and tag objects with 'name' property
-            tags = data['tags']
-            if tags:
-                tag_names = []
-                for tag in tags:
-                    if isinstance(tag, dict) and 'name' in tag:
-                        tag_names.append(tag['name'])
-                    elif isinstance(tag, str):
-                        tag_names.append(tag)
-                tags_string = ','.join(tag_names)
-            else:
-                tags_string = ''
-            feedback.tags = tags_string
+            feedback.set_tags(data['tags'])
+            # Tag links live in another table, so bump the row's version explicitly
+            feedback.updated_at = datetime.utcnow()
         
+        FeedbackStats.adjust(removed=[before], added=[feedback.counted_state()])
         db.session.commit()
         
         return jsonify({'feedback': feedback.to_dict()}), 200
@@ -216,9 +358,13 @@ def acknowledge_feedback(feedback_id):
         if feedback.employee_id != user_id:
             return jsonify({'error': 'You can only acknowledge your own feedback'}), 403
         
-        feedback.acknowledged = True
+        feedback.acknowledge()
         db.session.commit()
         
+        publish_event([feedback.manager_id, feedback.employee_id], 'feedback.acknowledged', {
+            'feedback_id': feedback.id
+        })
+        
         return jsonify({'feedback': feedback.to_dict()}), 200
         
     except Exception as e:
@@ -242,16 +388,59 @@ def get_feedback_comments(feedback_id):
         if not (feedback.manager_id == user_id or feedback.employee_id == user_id):
             return jsonify({'error': 'Access denied'}), 403
         
-        # Get only top-level comments (parent_id is None) and their replies will be nested
-        comments = FeedbackComment.query.filter_by(
-            feedback_id=feedback_id, 
-            parent_id=None
-        ).order_by(FeedbackComment.created_at.asc()).all()
-        
-        return jsonify({
-            'comments': [comment.to_dict(current_user_id=user_id) for comment in comments]
-        }), 200
-        
+        etag = compute_etag(
+            'comments', feedback_id, user_id, request.query_string, FeedbackComment.thread_version(feedback_id)
+        )
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        # Optional limits so huge threads can be fetched in pieces
+        args = request.args
+        max_depth = args.get('max_depth')
+        if max_depth is not None:
+            try:
+                max_depth = int(max_depth)
+            except ValueError:
+                return jsonify({'error': 'max_depth must be an integer'}), 400
+            if max_depth < 0:
+                return jsonify({'error': 'max_depth must not be negative'}), 400
+        parent_id = args.get('parent_id')
+        if parent_id is not None:
+            try:
+                parent_id = int(parent_id)
+            except ValueError:
+                return jsonify({'error': 'parent_id must be an integer'}), 400
+        limit = parse_limit(args.get('limit')) if args.get('limit') else None
+        cursor = args.get('cursor')
+        
+        next_cursor = None
+        if limit is None and not cursor:
+            # Whole thread (what the UI asks for): one flat ordered query
+            comments = FeedbackComment.load_tree(
+                feedback_id, current_user_id=user_id, max_depth=max_depth, root_id=parent_id
+            )
+        else:
+            # Top-level page keyset-paged in SQL; only its descendants are loaded
+            roots = FeedbackComment.thread_roots(
+                feedback_id, parent_id,
+                after=decode_cursor(cursor) if cursor else None,
+                limit=limit + 1 if limit is not None else None
+            )
+            if limit is not None and len(roots) > limit:
+                roots = roots[:limit]
+                next_cursor = encode_cursor(roots[-1].created_at, roots[-1].id)
+            comments = FeedbackComment.load_tree(
+                feedback_id, current_user_id=user_id, max_depth=max_depth, roots=roots
+            )
+        
+        return with_etag(jsonify({
+            'comments': comments,
+            'next_cursor': next_cursor
+        }), etag), 200
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -292,39 +481,36 @@ def create_feedback_comment(feedback_id):
         )
         
         db.session.add(comment)
-        db.session.commit()
+        Feedback.adjust_comments_count(feedback_id, 1)
         
-        # Send notification email to the other party (only for top-level comments)
+        # Queue a notification email to the other party (only for top-level comments);
+        # it is written in the same transaction and delivered by the dispatcher
         if not parent_id:
-            try:
-                # Get the other user's email (if manager comments, notify employee and vice versa)
-                if user_id == feedback.manager_id:
-                    # Manager commented, notify employee
-                    employee_emails = {
-                        2: "employee1@company.com",
-                        3: "employee2@company.com"
-                    }
-                    recipient_email = employee_emails.get(feedback.employee_id)
-                    recipient_name = {2: "Jane Employee", 3: "Bob Employee"}.get(feedback.employee_id)
-                    
-                    if recipient_email:
-                        subject = f"New comment on your feedback from {current_user['name']}"
-                        body = f"""
-                        <h2>New Comment on Your Feedback</h2>
-                        <p>Hi {recipient_name},</p>
-                        <p>{current_user['name']} has added a comment to your feedback:</p>
-                        <blockquote style="background-color: #f5f5f5; padding: 15px; border-left: 4px solid #007bff;">
-                            {comment_text}
-                        </blockquote>
-                        <p><a href="http://localhost:3000/feedback">View and respond to the comment</a></p>
-                        <p>Best regards,<br>Your Feedback System</p>
-                        """
-                        send_notification_email(recipient_email, subject, body)
-                else:
-                    # Employee commented, notify manager
-                    manager_email = "manager1@company.com"
-                    manager_name = "John Manager"
-                    
+            # Get the other user's email (if manager comments, notify employee and vice versa)
+            if user_id == feedback.manager_id:
+                # Manager commented, notify employee
+                recipient = get_user(feedback.employee_id)
+                
+                if recipient:
+                    recipient_name = recipient['name']
+                    subject = f"New comment on your feedback from {current_user['name']}"
+                    body = f"""
+                    <h2>New Comment on Your Feedback</h2>
+                    <p>Hi {recipient_name},</p>
+                    <p>{current_user['name']} has added a comment to your feedback:</p>
+                    <blockquote style="background-color: #f5f5f5; padding: 15px; border-left: 4px solid #007bff;">
+                        {comment_text}
+                    </blockquote>
+                    <p><a href="http://localhost:3000/feedback">View and respond to the comment</a></p>
+                    <p>Best regards,<br>Your Feedback System</p>
+                    """
+                    enqueue_notification(recipient['email'], subject, body)
+            else:
+                # Employee commented, notify manager
+                manager = get_user(feedback.manager_id)
+                
+                if manager:
+                    manager_name = manager['name']
                     subject = f"New comment on feedback you gave to {current_user['name']}"
                     body = f"""
                     <h2>New Comment on Feedback</h2>
@@ -336,11 +522,16 @@ def create_feedback_comment(feedback_id):
                     <p><a href="http://localhost:3000/feedback">View and respond to the comment</a></p>
                     <p>Best regards,<br>Your Feedback System</p>
                     """
-                    send_notification_email(manager_email, subject, body)
-                    
-            except Exception as e:
-                # Don't fail the comment creation if email fails
-                logging.error(f"Failed to send notification email: {str(e)}")
+                    enqueue_notification(manager['email'], subject, body)
+        
+        db.session.commit()
+        
+        publish_event([feedback.manager_id, feedback.employee_id], 'comment.created', {
+            'feedback_id': feedback.id,
+            'comment_id': comment.id,
+            'parent_id': comment.parent_id,
+            'user_id': user_id
+        })
         
         return jsonify({'comment': comment.to_dict(current_user_id=user_id)}), 201
         
@@ -403,8 +594,9 @@ def delete_feedback_comment(feedback_id, comment_id):
         if comment.user_id != current_user['id']:
             return jsonify({'error': 'You can only delete your own comments'}), 403
         
-        # Delete the comment (and its replies due to cascade)
+        # Delete the comment (its replies are kept and become top-level)
         db.session.delete(comment)
+        Feedback.adjust_comments_count(feedback_id, -1)
         db.session.commit()
         
         return jsonify({'message': 'Comment deleted successfully'}), 200
@@ -433,24 +625,25 @@ def toggle_comment_like(feedback_id, comment_id):
         if not (feedback.manager_id == user_id or feedback.employee_id == user_id):
             return jsonify({'error': 'Access denied'}), 403
         
-        # Check if user already liked this comment
-        liked_user_ids = []
-        if comment.liked_by_users:
-            liked_user_ids = [int(uid.strip()) for uid in comment.liked_by_users.split(',') if uid.strip()]
-        
-        if user_id in liked_user_ids:
-            # Unlike the comment
-            comment.remove_like(user_id)
+        # Atomic delete-or-insert on comment_likes; the unique constraint settles races
+        if comment.remove_like(user_id):
             action = 'unliked'
         else:
-            # Like the comment
             comment.add_like(user_id)
             action = 'liked'
         
         db.session.commit()
         
+        publish_event([feedback.manager_id, feedback.employee_id], 'comment.liked', {
+            'feedback_id': feedback.id,
+            'comment_id': comment.id,
+            'likes': comment.likes or 0,
+            'user_id': user_id,
+            'action': action
+        })
+        
         return jsonify({
-            'comment': comment.to_dict(current_user_id=user_id),
+            'comment': comment.to_dict(current_user_id=user_id, liked_by_user=(action == 'liked')),
             'action': action
         }), 200
         
@@ -458,6 +651,54 @@ def toggle_comment_like(feedback_id, comment_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@feedback_bp.route('/search', methods=['GET'])
+def search():
+    try:
+        current_user = get_current_user_from_request()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Search query is required'}), 400
+        
+        limit = parse_limit(request.args.get('limit'), default=20, maximum=100)
+        try:
+            offset = int(request.args.get('offset', 0))
+        except (ValueError, TypeError):
+            return jsonify({'error': 'offset must be an integer'}), 400
+        if offset < 0:
+            return jsonify({'error': 'offset must not be negative'}), 400
+        
+        results, next_offset = search_feedback(current_user, query, limit, offset)
+        
+        return jsonify({
+            'results': results,
+            'next_offset': next_offset
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@feedback_bp.route('/tags/stats', methods=['GET'])
+def get_tag_stats():
+    try:
+        current_user = get_current_user_from_request()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        if current_user['role'] == 'manager':
+            stats = Feedback.tag_stats(Feedback.manager_id, current_user['id'])
+        else:
+            stats = Feedback.tag_stats(Feedback.employee_id, current_user['id'])
+        
+        return jsonify({'tags': stats}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @feedback_bp.route('/dashboard', methods=['GET'])
 def get_dashboard_data():
     try:
@@ -467,38 +708,79 @@ def get_dashboard_data():
         
         user_id = current_user['id']
         
+        # Feedback entries are summaries unless ?fields= asks for the Text bodies
+        fields = parse_fields(
+            request.args.get('fields'), Feedback.LIST_FIELDS,
+            [name for name in Feedback.LIST_FIELDS if name not in Feedback.TEXT_FIELDS]
+        )
+        # Per-member totals and latest entry for the team view (managers only)
+        team_stats = bool(parse_bool(request.args.get('team_stats'), 'team_stats'))
+        
+        version = scope_version(current_user)
         if current_user['role'] == 'manager':
-            # Manager dashboard: team overview
-            team_members = User.query.filter_by(manager_id=user_id).all()
-            team_feedback = Feedback.query.filter_by(manager_id=user_id).all()
-            
-            sentiment_counts = {
-                'positive': len([f for f in team_feedback if f.sentiment == 'positive']),
-                'neutral': len([f for f in team_feedback if f.sentiment == 'neutral']),
-                'negative': len([f for f in team_feedback if f.sentiment == 'negative'])
-            }
+            # Team membership is part of the manager dashboard as well
+            version += tuple(db.session.query(
+                func.count(User.id), func.max(User.id)
+            ).filter(User.manager_id == user_id).one())
+        etag = compute_etag('dashboard', user_id, fields, team_stats, version)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        # Read-only projections: plain column rows, Text bodies fetched only when asked for
+        feedback_columns = projected_columns(Feedback.list_columns(), fields, Feedback.TEXT_FIELDS)
+        
+        if current_user['role'] == 'manager':
+            # Manager dashboard: team overview, aggregated in the database
+            team_members = User.list_rows(User.LIST_FIELDS, User.manager_id == user_id)
+            stats = FeedbackStats.summary(user_id, 'manager')
+            recent_feedback = db.session.query(*feedback_columns).filter(Feedback.manager_id == user_id).order_by(
+                Feedback.created_at.desc(), Feedback.id.desc()
+            ).limit(DASHBOARD_RECENT_LIMIT).all()
             
             dashboard_data = {
                 'team_members_count': len(team_members),
-                'total_feedback_given': len(team_feedback),
-                'sentiment_distribution': sentiment_counts,
-                'team_members': [member.to_dict() for member in team_members],
-                'recent_feedback': [f.to_dict() for f in team_feedback[-5:]]
+                'total_feedback_given': stats['total'],
+                'sentiment_distribution': stats['sentiment'],
+                'acknowledged_feedback': stats['acknowledged'],
+                'pending_feedback': stats['total'] - stats['acknowledged'],
+                'team_members': team_members,
+                'recent_feedback': only_fields(Feedback.to_dict_list(recent_feedback), fields)
             }
+            
+            if team_stats:
+                totals = FeedbackStats.by_employee(user_id, [member['id'] for member in team_members])
+                latest_rows = db.session.query(*feedback_columns).filter(
+                    Feedback.id.in_(Feedback.latest_ids_by_employee(user_id))
+                ).all()
+                latest = dict(zip(
+                    [row.employee_id for row in latest_rows],
+                    only_fields(Feedback.to_dict_list(latest_rows), fields)
+                ))
+                dashboard_data['team_stats'] = [{
+                    'employee_id': member['id'],
+                    **totals[member['id']],
+                    'latest_feedback': latest.get(member['id'])
+                } for member in team_members]
         else:
-            # Employee dashboard: personal feedback timeline
-            personal_feedback = Feedback.query.filter_by(employee_id=user_id).all()
-            acknowledged_count = len([f for f in personal_feedback if f.acknowledged])
+            # Employee dashboard: personal totals plus the latest entries of the timeline
+            stats = FeedbackStats.summary(user_id, 'employee')
+            timeline = db.session.query(*feedback_columns).filter(Feedback.employee_id == user_id).order_by(
+                Feedback.created_at.desc(), Feedback.id.desc()
+            ).limit(DASHBOARD_TIMELINE_LIMIT).all()
             
             dashboard_data = {
-                'total_feedback_received': len(personal_feedback),
-                'acknowledged_feedback': acknowledged_count,
-                'unacknowledged_feedback': len(personal_feedback) - acknowledged_count,
-                'feedback_timeline': [f.to_dict() for f in personal_feedback]
+                'total_feedback_received': stats['total'],
+                'acknowledged_feedback': stats['acknowledged'],
+                'unacknowledged_feedback': stats['total'] - stats['acknowledged'],
+                'sentiment_distribution': stats['sentiment'],
+                'feedback_timeline': only_fields(Feedback.to_dict_list(timeline), fields)
             }
         
-        return jsonify({'dashboard': dashboard_data}), 200
+        return with_etag(jsonify({'dashboard': dashboard_data}), etag), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -518,126 +800,111 @@ def export_feedback_pdf(feedback_id):
         if not (feedback.manager_id == user_id or feedback.employee_id == user_id):
             return jsonify({'error': 'Access denied'}), 403
         
-        # Get comments for this feedback
-        comments = FeedbackComment.query.filter_by(feedback_id=feedback_id).order_by(FeedbackComment.created_at.asc()).all()
+        # Rendered once per (feedback, updated_at, latest comment) version and cached
+        pdf_data = get_feedback_pdf(feedback)
         
-        # Create PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+        # Serve the bytes directly instead of copying them into another buffer
+        response = Response(pdf_data, mimetype='application/pdf')
+        response.headers.set('Content-Disposition', 'attachment', filename=pdf_filename(feedback))
+        return response
         
-        # Container for the 'Flowable' objects
-        elements = []
+    except Exception as e:
+        logging.error(f"Failed to generate PDF: {str(e)}")
+        return jsonify({'error': 'Failed to generate PDF'}), 500
+
+@feedback_bp.route('/export-jobs', methods=['POST'])
+def create_export_job():
+    try:
+        current_user = get_current_user_from_request()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
         
-        # Get styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            textColor=colors.HexColor('#1f2937')
-        )
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
+        export_format = data.get('format', 'zip')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': 'Format must be zip or pdf'}), 400
+        
+        # Either an explicit set of IDs or a listing-style filter, always scoped to the caller
+        filters = data.get('filter') or {}
+        if not isinstance(filters, dict):
+            return jsonify({'error': 'filter must be an object'}), 400
+        query = filtered_feedback_query(current_user, filters)
+        feedback_ids = data.get('feedback_ids')
+        if feedback_ids is not None:
+            if not isinstance(feedback_ids, list) or not all(isinstance(i, int) for i in feedback_ids):
+                return jsonify({'error': 'feedback_ids must be a list of integers'}), 400
+            query = query.filter(Feedback.id.in_(feedback_ids))
+        
+        max_items = current_app.config['EXPORT_MAX_ITEMS']
+        ids = [row[0] for row in query.with_entities(Feedback.id).limit(max_items + 1).all()]
+        if not ids:
+            return jsonify({'error': 'No feedback matched'}), 404
+        if len(ids) > max_items:
+            return jsonify({'error': f'At most {max_items} feedback items can be exported at once'}), 400
+        
+        job = start_export_job(current_user['id'], ids, export_format)
+        
+        return jsonify({'job': job.to_dict()}), 202
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@feedback_bp.route('/export-jobs/<job_id>', methods=['GET'])
+def get_export_job(job_id):
+    try:
+        current_user = get_current_user_from_request()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
         
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.HexColor('#374151')
-        )
+        job = db.session.get(ExportJob, job_id)
+        if not job or job.owner_id != current_user['id']:
+            return jsonify({'error': 'Export job not found'}), 404
         
-        # Title
-        title = Paragraph("Feedback Report", title_style)
-        elements.append(title)
-        elements.append(Spacer(1, 12))
-        
-        # Feedback details table
-        feedback_data = [
-            ['Manager:', feedback.manager.name],
-            ['Employee:', feedback.employee.name],
-            ['Date Created:', feedback.created_at.strftime('%B %d, %Y at %I:%M %p')],
-            ['Sentiment:', feedback.sentiment.title()],
-            ['Status:', 'Acknowledged' if feedback.acknowledged else 'Pending'],
-        ]
-        
-        if feedback.tags:
-            feedback_data.append(['Tags:', ', '.join(feedback.tags.split(','))])
-        
-        feedback_table = Table(feedback_data, colWidths=[1.5*inch, 4*inch])
-        feedback_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        
-        elements.append(feedback_table)
-        elements.append(Spacer(1, 20))
-        
-        # Strengths section
-        strengths_heading = Paragraph("Strengths", heading_style)
-        elements.append(strengths_heading)
-        strengths_text = Paragraph(feedback.strengths, styles['Normal'])
-        elements.append(strengths_text)
-        elements.append(Spacer(1, 15))
-        
-        # Areas to improve section
-        improve_heading = Paragraph("Areas to Improve", heading_style)
-        elements.append(improve_heading)
-        improve_text = Paragraph(feedback.areas_to_improve, styles['Normal'])
-        elements.append(improve_text)
-        elements.append(Spacer(1, 20))
-        
-        # Comments section
-        if comments:
-            comments_heading = Paragraph("Comments & Discussion", heading_style)
-            elements.append(comments_heading)
-            elements.append(Spacer(1, 10))
-            
-            for comment in comments:
-                # Comment header
-                comment_header = f"<b>{comment.to_dict()['user_name']}</b> ({comment.to_dict()['user_role']}) - {comment.created_at.strftime('%B %d, %Y at %I:%M %p')}"
-                header_para = Paragraph(comment_header, styles['Normal'])
-                elements.append(header_para)
-                
-                # Comment text
-                comment_text = Paragraph(comment.comment_text, styles['Normal'])
-                elements.append(comment_text)
-                elements.append(Spacer(1, 10))
+        # A job whose worker died never finishes; report it failed once past its deadline
+        fail_if_stale(job)
         
-        # Footer
-        elements.append(Spacer(1, 30))
-        footer_text = f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
-        footer = Paragraph(footer_text, styles['Normal'])
-        elements.append(footer)
+        return jsonify({'job': job.to_dict()}), 200
         
-        # Build PDF
-        doc.build(elements)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@feedback_bp.route('/export-jobs/<job_id>/download', methods=['GET'])
+def download_export_job(job_id):
+    try:
+        current_user = get_current_user_from_request()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
         
-        # Get the value of the BytesIO buffer
-        pdf_data = buffer.getvalue()
-        buffer.close()
+        job = db.session.get(ExportJob, job_id)
+        if not job or job.owner_id != current_user['id']:
+            return jsonify({'error': 'Export job not found'}), 404
         
-        # Create a new BytesIO object for sending
-        pdf_buffer = BytesIO(pdf_data)
+        if job.status != 'completed':
+            return jsonify({'error': 'Export is not ready', 'job': job.to_dict()}), 409
         
-        # Generate filename
-        filename = f"feedback_{feedback.employee.name.replace(' ', '_')}_{feedback.created_at.strftime('%Y%m%d')}.pdf"
+        # Files live in EXPORT_DIR on the host that built them; a completed job
+        # whose file this host can't see was built elsewhere or has been cleaned up
+        if not job.file_path or not os.path.exists(job.file_path):
+            return jsonify({
+                'error': 'Export file is not available on this server, request a new export',
+                'job': job.to_dict()
+            }), 410
         
+        # send_file streams the archive from disk in chunks
         return send_file(
-            pdf_buffer,
+            job.file_path,
             as_attachment=True,
-            download_name=filename,
-            mimetype='application/pdf'
+            download_name=f"feedback_export_{job.created_at.strftime('%Y%m%d')}.{job.format}",
+            mimetype=EXPORT_FORMATS[job.format]
         )
         
     except Exception as e:
-        logging.error(f"Failed to generate PDF: {str(e)}")
-        return jsonify({'error': 'Failed to generate PDF'}), 500
+        return jsonify({'error': str(e)}), 500
 
 # NEW: Feedback Request endpoints
 @feedback_bp.route('/requests', methods=['POST'])
@@ -675,13 +942,12 @@ def create_feedback_request():
         )
         
         db.session.add(feedback_request)
-        db.session.commit()
         
-        # Send notification email to manager
-        try:
-            manager_email = "manager1@company.com"
-            manager_name = "John Manager"
-            
+        # Queue notification email to manager in the same transaction
+        manager = get_user(manager_id)
+        
+        if manager:
+            manager_name = manager['name']
             subject = f"Feedback request from {current_user['name']}"
             body = f"""
             <h2>New Feedback Request</h2>
@@ -691,9 +957,14 @@ def create_feedback_request():
             <p><a href="http://localhost:3000/feedback-requests">View and respond to the request</a></p>
             <p>Best regards,<br>Your Feedback System</p>
             """
-            send_notification_email(manager_email, subject, body)
-        except Exception as e:
-            logging.error(f"Failed to send request notification email: {str(e)}")
+            enqueue_notification(manager['email'], subject, body)
+        
+        db.session.commit()
+        
+        publish_event([feedback_request.manager_id, feedback_request.employee_id], 'request.created', {
+            'request_id': feedback_request.id,
+            'status': feedback_request.status
+        })
         
         return jsonify({'request': feedback_request.to_dict()}), 201
         
@@ -710,17 +981,30 @@ def get_feedback_requests():
         
         user_id = current_user['id']
         
-        if current_user['role'] == 'manager':
-            # Managers see requests from their team members
-            requests = FeedbackRequest.query.filter_by(manager_id=user_id).order_by(FeedbackRequest.created_at.desc()).all()
-        else:
-            # Employees see their own requests
-            requests = FeedbackRequest.query.filter_by(employee_id=user_id).order_by(FeedbackRequest.created_at.desc()).all()
+        # Summaries unless ?fields= asks for the message text
+        fields = parse_fields(
+            request.args.get('fields'), FeedbackRequest.LIST_FIELDS,
+            [name for name in FeedbackRequest.LIST_FIELDS if name not in FeedbackRequest.TEXT_FIELDS]
+        )
         
-        return jsonify({
-            'requests': [req.to_dict() for req in requests]
-        }), 200
+        owner_column = FeedbackRequest.manager_id if current_user['role'] == 'manager' else FeedbackRequest.employee_id
+        etag = compute_etag('requests', user_id, fields, FeedbackRequest.scope_version(owner_column, user_id))
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        # Managers see requests from their team members, employees their own requests;
+        # plain column rows, read-only
+        requests = db.session.query(
+            *projected_columns(FeedbackRequest.list_columns(), fields, FeedbackRequest.TEXT_FIELDS)
+        ).filter(owner_column == user_id).order_by(FeedbackRequest.created_at.desc()).all()
         
+        return with_etag(jsonify({
+            'requests': only_fields(FeedbackRequest.to_dict_list(requests), fields)
+        }), etag), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -749,44 +1033,37 @@ def update_feedback_request(request_id):
         if status == 'completed':
             feedback_request.completed_at = datetime.utcnow()
         
+        # Queue notification email to employee in the same transaction
+        recipient = get_user(feedback_request.employee_id)
+        
+        if recipient:
+            recipient_name = recipient['name']
+            if status == 'completed':
+                subject = f"Your feedback request has been completed"
+                body = f"""
+                <h2>Feedback Request Completed</h2>
+                <p>Hi {recipient_name},</p>
+                <p>Great news! {current_user['name']} has completed your feedback request.</p>
+                <p><a href="http://localhost:3000/feedback">View your new feedback</a></p>
+                <p>Best regards,<br>Your Feedback System</p>
+                """
+            else:
+                subject = f"Your feedback request has been declined"
+                body = f"""
+                <h2>Feedback Request Declined</h2>
+                <p>Hi {recipient_name},</p>
+                <p>{current_user['name']} has declined your feedback request. You can try requesting again later or discuss this directly with your manager.</p>
+                <p>Best regards,<br>Your Feedback System</p>
+                """
+            
+            enqueue_notification(recipient['email'], subject, body)
+        
         db.session.commit()
         
-        # Send notification email to employee
-        try:
-            employee_emails = {
-                2: "employee1@company.com",
-                3: "employee2@company.com"
-            }
-            employee_names = {
-                2: "Jane Employee", 
-                3: "Bob Employee"
-            }
-            
-            recipient_email = employee_emails.get(feedback_request.employee_id)
-            recipient_name = employee_names.get(feedback_request.employee_id)
-            
-            if recipient_email:
-                if status == 'completed':
-                    subject = f"Your feedback request has been completed"
-                    body = f"""
-                    <h2>Feedback Request Completed</h2>
-                    <p>Hi {recipient_name},</p>
-                    <p>Great news! {current_user['name']} has completed your feedback request.</p>
-                    <p><a href="http://localhost:3000/feedback">View your new feedback</a></p>
-                    <p>Best regards,<br>Your Feedback System</p>
-                    """
-                else:
-                    subject = f"Your feedback request has been declined"
-                    body = f"""
-                    <h2>Feedback Request Declined</h2>
-                    <p>Hi {recipient_name},</p>
-                    <p>{current_user['name']} has declined your feedback request. You can try requesting again later or discuss this directly with your manager.</p>
-                    <p>Best regards,<br>Your Feedback System</p>
-                    """
-                
-                send_notification_email(recipient_email, subject, body)
-        except Exception as e:
-            logging.error(f"Failed to send status update notification email: {str(e)}")
+        publish_event([feedback_request.manager_id, feedback_request.employee_id], 'request.updated', {
+            'request_id': feedback_request.id,
+            'status': feedback_request.status
+        })
         
         return jsonify({'request': feedback_request.to_dict()}), 200
         
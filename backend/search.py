@@ -0,0 +1,144 @@
+import re
+from html import escape
+from sqlalchemy import text
+from models import db
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+# The database marks matches with control characters; the text is HTML-escaped
+# before they are swapped for the <mark> tags, so stored markup never gets through
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+
+# Postgres: these expressions must match the GIN indexes from migration 0006 exactly
+FEEDBACK_TSVECTOR = "to_tsvector('english', f.strengths || ' ' || f.areas_to_improve)"
+COMMENT_TSVECTOR = "to_tsvector('english', c.comment_text)"
+HEADLINE_OPTIONS = f"StartSel={MATCH_START}, StopSel={MATCH_END}, MaxFragments=2, MaxWords=30, MinWords=10"
+
+POSTGRES_FEEDBACK_SQL = f"""
+    SELECT hit.*,
+           ts_headline('english', hit.strengths, hit.query, :headline) AS strengths_hl,
+           ts_headline('english', hit.areas_to_improve, hit.query, :headline) AS areas_hl
+    FROM (
+        SELECT f.id, f.manager_id, f.employee_id, f.created_at, f.strengths, f.areas_to_improve,
+               q AS query, ts_rank({FEEDBACK_TSVECTOR}, q) AS rank
+        FROM feedback f, websearch_to_tsquery('english', :q) q
+        WHERE {FEEDBACK_TSVECTOR} @@ q AND f.{{owner}} = :user_id
+        ORDER BY rank DESC, f.id DESC
+        LIMIT :n
+    ) hit
+    ORDER BY hit.rank DESC, hit.id DESC
+"""
+
+POSTGRES_COMMENT_SQL = f"""
+    SELECT hit.*,
+           ts_headline('english', hit.comment_text, hit.query, :headline) AS comment_hl
+    FROM (
+        SELECT c.id, c.feedback_id, c.user_id, c.created_at, c.comment_text,
+               q AS query, ts_rank({COMMENT_TSVECTOR}, q) AS rank
+        FROM feedback_comments c
+        JOIN feedback f ON f.id = c.feedback_id,
+        websearch_to_tsquery('english', :q) q
+        WHERE {COMMENT_TSVECTOR} @@ q AND f.{{owner}} = :user_id
+        ORDER BY rank DESC, c.id DESC
+        LIMIT :n
+    ) hit
+    ORDER BY hit.rank DESC, hit.id DESC
+"""
+
+# SQLite: FTS5 external-content tables kept in sync by triggers (migration 0006).
+# bm25() is lower-is-better, so it is negated into a higher-is-better score.
+SQLITE_FEEDBACK_SQL = f"""
+    SELECT f.id, f.manager_id, f.employee_id, f.created_at,
+           -bm25(feedback_fts) AS rank,
+           highlight(feedback_fts, 0, '{MATCH_START}', '{MATCH_END}') AS strengths_hl,
+           highlight(feedback_fts, 1, '{MATCH_START}', '{MATCH_END}') AS areas_hl
+    FROM feedback_fts
+    JOIN feedback f ON f.id = feedback_fts.rowid
+    WHERE feedback_fts MATCH :q AND f.{{owner}} = :user_id
+    ORDER BY bm25(feedback_fts), f.id DESC
+    LIMIT :n
+"""
+
+SQLITE_COMMENT_SQL = f"""
+    SELECT c.id, c.feedback_id, c.user_id, c.created_at,
+           -bm25(feedback_comments_fts) AS rank,
+           highlight(feedback_comments_fts, 0, '{MATCH_START}', '{MATCH_END}') AS comment_hl
+    FROM feedback_comments_fts
+    JOIN feedback_comments c ON c.id = feedback_comments_fts.rowid
+    JOIN feedback f ON f.id = c.feedback_id
+    WHERE feedback_comments_fts MATCH :q AND f.{{owner}} = :user_id
+    ORDER BY bm25(feedback_comments_fts), c.id DESC
+    LIMIT :n
+"""
+
+def fts5_query(query):
+    """Turn free text into an FTS5 query of quoted terms, so user input can't inject syntax"""
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"' for term in terms)
+
+def safe_highlight(value):
+    """HTML-escape a highlighted snippet, then turn the match markers into <mark> tags"""
+    if value is None:
+        return None
+    return escape(value).replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_END, HIGHLIGHT_END)
+
+def _isoformat(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.replace(' ', 'T')
+    return value.isoformat()
+
+def search_feedback(current_user, query, limit, offset=0):
+    """
+    Ranked full-text search over feedback strengths/areas_to_improve and
+    comment text, limited to feedback the caller gave (managers) or received
+    (employees). Returns (results, next_offset).
+    """
+    owner = 'manager_id' if current_user['role'] == 'manager' else 'employee_id'
+    window = offset + limit + 1
+    
+    if db.engine.dialect.name == 'postgresql':
+        params = {'q': query, 'user_id': current_user['id'], 'n': window, 'headline': HEADLINE_OPTIONS}
+        feedback_sql, comment_sql = POSTGRES_FEEDBACK_SQL, POSTGRES_COMMENT_SQL
+    else:
+        match = fts5_query(query)
+        if not match:
+            return [], None
+        params = {'q': match, 'user_id': current_user['id'], 'n': window}
+        feedback_sql, comment_sql = SQLITE_FEEDBACK_SQL, SQLITE_COMMENT_SQL
+    
+    results = []
+    for row in db.session.execute(text(feedback_sql.format(owner=owner)), params).mappings():
+        results.append({
+            'type': 'feedback',
+            'feedback_id': row['id'],
+            'manager_id': row['manager_id'],
+            'employee_id': row['employee_id'],
+            'created_at': _isoformat(row['created_at']),
+            'rank': float(row['rank']),
+            'highlights': {
+                'strengths': safe_highlight(row['strengths_hl']),
+                'areas_to_improve': safe_highlight(row['areas_hl'])
+            }
+        })
+    for row in db.session.execute(text(comment_sql.format(owner=owner)), params).mappings():
+        results.append({
+            'type': 'comment',
+            'feedback_id': row['feedback_id'],
+            'comment_id': row['id'],
+            'user_id': row['user_id'],
+            'created_at': _isoformat(row['created_at']),
+            'rank': float(row['rank']),
+            'highlights': {
+                'comment_text': safe_highlight(row['comment_hl'])
+            }
+        })
+    
+    # Each source is already ranked and capped at the window, so merging them is enough
+    results.sort(key=lambda hit: hit['rank'], reverse=True)
+    page = results[offset:offset + limit]
+    next_offset = offset + limit if len(results) > offset + limit else None
+    return page, next_offset
@@ -0,0 +1,54 @@
+import os
+import sys
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, create_sample_data
+from config import Config
+from identity import get_user
+from models import db, User
+from tokens import issue_access_token
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App on a fresh SQLite file, migrated to head and seeded with the demo data"""
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(Config, 'SQLALCHEMY_ENGINE_OPTIONS', {})
+    monkeypatch.setattr(Config, 'TESTING', True, raising=False)
+    app = create_app()
+    with app.app_context():
+        upgrade()
+        create_sample_data()
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def users(app):
+    """Demo users by email: one manager and two employees on the manager's team"""
+    return {user.email: user.id for user in User.query.all()}
+
+@pytest.fixture
+def auth(app):
+    """Authorization headers for a user id"""
+    def headers(user_id):
+        return {'Authorization': f'Bearer {issue_access_token(get_user(user_id))}'}
+    return headers
+
+@pytest.fixture
+def statements(app):
+    """Every SQL statement (and its parameters) the app runs while the test records"""
+    recorded = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield recorded
+    event.remove(db.engine, 'before_cursor_execute', record)
@@ -0,0 +1,44 @@
+"""
+Every query a read route runs must reach its rows through an index: SQLite's
+EXPLAIN QUERY PLAN may SEARCH tables but never SCAN one.
+"""
+import re
+import pytest
+from models import db
+
+MANAGER = 'manager1@company.com'
+EMPLOYEE = 'employee1@company.com'
+
+ROUTES = [
+    (MANAGER, '/api/feedback/'),
+    (EMPLOYEE, '/api/feedback/'),
+    (MANAGER, '/api/feedback/?sentiment=positive&acknowledged=true&tag=teamwork&date_from=2020-01-01&date_to=2030-01-01'),
+    (MANAGER, '/api/feedback/dashboard'),
+    (EMPLOYEE, '/api/feedback/dashboard'),
+    (MANAGER, '/api/feedback/1/comments?limit=10&max_depth=2'),
+    (MANAGER, '/api/feedback/requests'),
+    (EMPLOYEE, '/api/feedback/requests'),
+    (MANAGER, '/api/feedback/tags/stats'),
+    (MANAGER, '/api/users/team'),
+]
+
+def table_scans(statement, parameters):
+    """Tables the plan reads in full; CTEs such as the comment thread are not tables"""
+    plan = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    scanned = [re.match(r'SCAN (\w+)', row[3]) for row in plan]
+    return [match.group(1) for match in scanned if match and match.group(1) in db.metadata.tables]
+
+@pytest.mark.parametrize('email, path', ROUTES)
+def test_route_queries_use_indexes(client, users, auth, statements, email, path):
+    headers = auth(users[email])
+    reply = client.post('/api/feedback/1/comments', json={'comment_text': 'Thanks'}, headers=auth(users[MANAGER]))
+    assert reply.status_code == 201
+    
+    statements.clear()
+    assert client.get(path, headers=headers).status_code == 200
+    queries = [(statement, parameters) for statement, parameters in statements
+               if statement.lstrip().upper().startswith(('SELECT', 'WITH'))]
+    assert queries
+    
+    for statement, parameters in queries:
+        assert table_scans(statement, parameters) == [], statement
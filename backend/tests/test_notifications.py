@@ -0,0 +1,87 @@
+"""
+The outbox dispatcher against a real SMTP server (aiosmtpd) that turns away
+the first deliveries: rows are retried with backoff until they get through.
+"""
+import socket
+from datetime import datetime
+import pytest
+from aiosmtpd.controller import Controller
+from models import db, NotificationOutbox
+from notifications import enqueue_notification, dispatch_pending
+
+class FlakyHandler:
+    """Rejects the first `rejections` messages with a temporary failure, then accepts"""
+    
+    def __init__(self, rejections):
+        self.rejections = rejections
+        self.attempts = 0
+        self.delivered = []
+    
+    async def handle_DATA(self, server, session, envelope):
+        self.attempts += 1
+        if self.attempts <= self.rejections:
+            return '451 4.3.0 Try again later'
+        self.delivered.append(envelope)
+        return '250 OK'
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def smtp_server(app):
+    handler = FlakyHandler(rejections=2)
+    controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    app.config.update(SMTP_HOST=controller.hostname, SMTP_PORT=controller.port, SMTP_USE_TLS=False)
+    yield handler
+    controller.stop()
+
+def test_dispatcher_retries_until_the_server_accepts(app, smtp_server):
+    app.config.update(NOTIFICATION_BACKOFF_BASE=60, NOTIFICATION_MAX_ATTEMPTS=5)
+    notification = enqueue_notification('employee1@company.com', 'New comment', '<p>Hello</p>')
+    db.session.commit()
+    
+    # First attempt is turned away: the row stays pending and backs off by the base delay
+    started = datetime.utcnow()
+    assert dispatch_pending() == 1
+    assert notification.status == 'pending'
+    assert notification.attempts == 1
+    assert '451' in notification.last_error
+    assert (notification.next_attempt_at - started).total_seconds() >= 59
+    
+    # Nothing is due until the backoff has passed
+    assert dispatch_pending() == 0
+    
+    # Second failure doubles the delay; the third attempt is delivered
+    notification.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    started = datetime.utcnow()
+    assert dispatch_pending() == 1
+    assert notification.attempts == 2
+    assert (notification.next_attempt_at - started).total_seconds() >= 119
+    
+    notification.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    assert dispatch_pending() == 1
+    
+    delivered = db.session.get(NotificationOutbox, notification.id)
+    assert delivered.status == 'sent'
+    assert delivered.attempts == 3
+    assert delivered.last_error is None
+    assert smtp_server.attempts == 3
+    assert [envelope.rcpt_tos for envelope in smtp_server.delivered] == [['employee1@company.com']]
+
+def test_dispatcher_gives_up_after_max_attempts(app, smtp_server):
+    app.config.update(NOTIFICATION_BACKOFF_BASE=0, NOTIFICATION_MAX_ATTEMPTS=2)
+    notification = enqueue_notification('employee1@company.com', 'New comment', '<p>Hello</p>')
+    db.session.commit()
+    
+    assert dispatch_pending() == 1
+    assert dispatch_pending() == 1
+    assert dispatch_pending() == 0
+    
+    assert notification.status == 'failed'
+    assert notification.attempts == 2
+    assert smtp_server.delivered == []
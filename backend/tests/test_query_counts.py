@@ -0,0 +1,59 @@
+"""
+The listing, dashboard and comment endpoints serialize whole result sets in
+batches, so the number of SQL statements they run must not grow with the data.
+"""
+
+MANAGER = 'manager1@company.com'
+EMPLOYEE = 'employee1@company.com'
+
+def add_feedback(client, headers, employee_ids, count):
+    items = [{
+        'employee_id': employee_ids[i % len(employee_ids)],
+        'strengths': f'Strength {i}',
+        'areas_to_improve': f'Area {i}',
+        'sentiment': ('positive', 'neutral', 'negative')[i % 3],
+        'tags': [f'tag-{i % 4}']
+    } for i in range(count)]
+    response = client.post('/api/feedback/bulk', json=items, headers=headers)
+    assert response.status_code == 201
+
+def add_thread(client, headers, feedback_id, count):
+    """count comments, each one replying to the previous, so the thread also gets deeper"""
+    parent_id = None
+    for i in range(count):
+        body = {'comment_text': f'Comment {i}'}
+        if parent_id:
+            body['parent_id'] = parent_id
+        response = client.post(f'/api/feedback/{feedback_id}/comments', json=body, headers=headers)
+        assert response.status_code == 201
+        parent_id = response.get_json()['comment']['id']
+
+def count_queries(client, statements, path, headers):
+    # The first call warms the identity cache; the second is the one measured
+    assert client.get(path, headers=headers).status_code == 200
+    statements.clear()
+    assert client.get(path, headers=headers).status_code == 200
+    return len(statements)
+
+def test_query_count_does_not_grow_with_the_data(client, users, auth, statements):
+    manager = auth(users[MANAGER])
+    employee = auth(users[EMPLOYEE])
+    team = [users[EMPLOYEE], users['employee2@company.com']]
+    paths = [
+        ('/api/feedback/?limit=200', manager),
+        ('/api/feedback/?limit=200', employee),
+        ('/api/feedback/dashboard?fields=id,strengths,employee_name,manager_name', manager),
+        ('/api/feedback/dashboard?team_stats=true', manager),
+        ('/api/feedback/dashboard', employee),
+        ('/api/feedback/1/comments', manager),
+    ]
+    
+    add_feedback(client, manager, team, 3)
+    add_thread(client, manager, 1, 2)
+    small = [count_queries(client, statements, path, headers) for path, headers in paths]
+    
+    add_feedback(client, manager, team, 60)
+    add_thread(client, manager, 1, 25)
+    large = [count_queries(client, statements, path, headers) for path, headers in paths]
+    
+    assert large == small
@@ -0,0 +1,99 @@
+import threading
+import time
+from flask_jwt_extended import (
+    JWTManager, create_access_token, create_refresh_token, decode_token, get_jwt, verify_jwt_in_request
+)
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+
+jwt = JWTManager()
+
+# Identity fields carried in every token so authorization needs no lookup
+CLAIM_FIELDS = ('name', 'role', 'manager_id')
+
+class RevokedTokens:
+    """
+    Thread-safe in-memory set of revoked token ids (jti). Each entry is kept
+    only until the token would have expired anyway, so the set stays small.
+    Revocations are per worker process and are lost on restart.
+    """
+    
+    def __init__(self):
+        self._expires = {}
+        self._lock = threading.Lock()
+    
+    def add(self, jti, expires_at):
+        now = time.time()
+        with self._lock:
+            self._expires[jti] = expires_at
+            for expired in [key for key, exp in self._expires.items() if exp <= now]:
+                del self._expires[expired]
+    
+    def __contains__(self, jti):
+        with self._lock:
+            return jti in self._expires
+    
+    def __len__(self):
+        return len(self._expires)
+
+revoked_tokens = RevokedTokens()
+
+@jwt.token_in_blocklist_loader
+def is_token_revoked(jwt_header, jwt_payload):
+    return jwt_payload['jti'] in revoked_tokens
+
+def _claims(user):
+    return {field: user.get(field) for field in CLAIM_FIELDS}
+
+def issue_access_token(user):
+    """Access token for an identity dict (see identity.get_user)"""
+    return create_access_token(identity=str(user['id']), additional_claims=_claims(user))
+
+def issue_tokens(user):
+    """Access and refresh tokens for an identity dict"""
+    return {
+        'access_token': issue_access_token(user),
+        'refresh_token': create_refresh_token(identity=str(user['id']), additional_claims=_claims(user))
+    }
+
+def user_from_claims(claims):
+    user = {field: claims.get(field) for field in CLAIM_FIELDS}
+    user['id'] = int(claims['sub'])
+    return user
+
+def current_token_user(refresh=False):
+    """
+    Verify the request's Bearer token (signature, expiry, type, revocation) and
+    return the identity carried in its claims, or None. Never touches the database.
+    """
+    try:
+        verify_jwt_in_request(refresh=refresh)
+        return user_from_claims(get_jwt())
+    except (JWTExtendedException, PyJWTError, KeyError, ValueError):
+        return None
+
+def user_from_encoded_token(encoded_token):
+    """
+    Identity from an access token passed outside the Authorization header
+    (EventSource cannot set headers), or None if invalid, expired or revoked
+    """
+    try:
+        claims = decode_token(encoded_token)
+        if claims.get('type') != 'access' or claims['jti'] in revoked_tokens:
+            return None
+        return user_from_claims(claims)
+    except (JWTExtendedException, PyJWTError, KeyError, ValueError):
+        return None
+
+def revoke_current_token():
+    claims = get_jwt()
+    revoked_tokens.add(claims['jti'], claims['exp'])
+
+def revoke_encoded_token(encoded_token):
+    """Revoke a token passed as a string (e.g. a refresh token on logout); False if invalid"""
+    try:
+        claims = decode_token(encoded_token)
+    except (JWTExtendedException, PyJWTError):
+        return False
+    revoked_tokens.add(claims['jti'], claims['exp'])
+    return True
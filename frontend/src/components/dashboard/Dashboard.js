@@ -3,6 +3,7 @@ import { useAuth } from "../../context/AuthContext";
 import { useNavigate } from "react-router-dom";
 import { motion } from "framer-motion";
 import axios from "axios";
+import { API_ENDPOINTS } from "../../config/api";
 import {
   ChartBarIcon,
   UserGroupIcon,
@@ -23,6 +24,9 @@ import {
 } from "@heroicons/react/24/outline";
 import { CheckCircleIcon as CheckCircleIconSolid } from "@heroicons/react/24/solid";
 
+const DASHBOARD_FEEDBACK_FIELDS =
+  "id,employee_name,manager_name,sentiment,strengths,acknowledged,created_at";
+
 const Dashboard = () => {
   const { user, isManager, isAuthenticated } = useAuth();
   const navigate = useNavigate();
@@ -34,47 +38,26 @@ const Dashboard = () => {
   const fetchDashboardData = useCallback(async () => {
     try {
       setLoading(true);
-      const [feedbackResponse] = await Promise.all([
-        axios.get("/api/feedback/"),
-      ]);
-
-      const feedback = feedbackResponse.data.feedback;
-      setRecentFeedback(feedback.slice(0, 5));
+      // Totals are aggregated by the server; only the latest entries are sent
+      const response = await axios.get(API_ENDPOINTS.FEEDBACK_DASHBOARD, {
+        params: { fields: DASHBOARD_FEEDBACK_FIELDS },
+      });
+      const dashboard = response.data.dashboard;
 
-      // Calculate stats
       if (isManager) {
-        const totalFeedback = feedback.length;
-        const sentimentCounts = feedback.reduce(
-          (acc, item) => {
-            acc[item.sentiment] = (acc[item.sentiment] || 0) + 1;
-            return acc;
-          },
-          { positive: 0, neutral: 0, negative: 0 }
-        );
-
+        setRecentFeedback(dashboard.recent_feedback);
         setStats({
-          totalFeedback,
-          sentimentCounts,
-          acknowledgedCount: feedback.filter((f) => f.acknowledged).length,
+          totalFeedback: dashboard.total_feedback_given,
+          sentimentCounts: dashboard.sentiment_distribution,
+          acknowledgedCount: dashboard.acknowledged_feedback,
         });
       } else {
-        const totalReceived = feedback.length;
-        const acknowledged = feedback.filter((f) => f.acknowledged).length;
-        const pending = totalReceived - acknowledged;
-
-        const sentimentCounts = feedback.reduce(
-          (acc, item) => {
-            acc[item.sentiment] = (acc[item.sentiment] || 0) + 1;
-            return acc;
-          },
-          { positive: 0, neutral: 0, negative: 0 }
-        );
-
+        setRecentFeedback(dashboard.feedback_timeline.slice(0, 5));
         setStats({
-          totalReceived,
-          acknowledged,
-          pending,
-          sentimentCounts,
+          totalReceived: dashboard.total_feedback_received,
+          acknowledged: dashboard.acknowledged_feedback,
+          pending: dashboard.unacknowledged_feedback,
+          sentimentCounts: dashboard.sentiment_distribution,
         });
       }
     } catch (error) {
@@ -1,6 +1,10 @@
 import React, { useState, useEffect, useMemo, useCallback } from "react";
 import { useAuth } from "../../context/AuthContext";
-import { getApiUrl } from "../../config/api";
+import {
+  API_ENDPOINTS,
+  authFetch,
+  fetchFeedbackPage,
+} from "../../config/api";
 import { motion, AnimatePresence } from "framer-motion";
 import {
   DocumentTextIcon,
@@ -21,9 +25,32 @@ import FeedbackComments from "./FeedbackComments";
 import toast from "react-hot-toast";
 import axios from "axios";
 
+// Start of a "last week/month/quarter" range as an ISO date, or null for all time
+const dateRangeStart = (dateRange) => {
+  const start = new Date();
+  switch (dateRange) {
+    case "week":
+      start.setDate(start.getDate() - 7);
+      break;
+    case "month":
+      start.setMonth(start.getMonth() - 1);
+      break;
+    case "quarter":
+      start.setMonth(start.getMonth() - 3);
+      break;
+    default:
+      return null;
+  }
+  return start.toISOString().split("T")[0];
+};
+
 const FeedbackList = () => {
   const { user } = useAuth();
   const [feedback, setFeedback] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [summary, setSummary] = useState(null);
+  const [allTags, setAllTags] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [selectedFeedbackId, setSelectedFeedbackId] = useState(null);
@@ -35,7 +62,7 @@ const FeedbackList = () => {
     sentiment: "all",
     acknowledged: "all",
     dateRange: "all",
-    tags: [],
+    tag: "",
   });
   const [sortBy, setSortBy] = useState("date_desc");
   const [selectedItems, setSelectedItems] = useState([]);
@@ -43,11 +70,56 @@ const FeedbackList = () => {
   const [showFilters, setShowFilters] = useState(false);
   const [expandedCards, setExpandedCards] = useState(new Set());
 
+  // Sentiment, acknowledged, tag and date filters are applied by the server
+  const serverFilters = useMemo(() => {
+    const params = {};
+    if (filters.sentiment !== "all") {
+      params.sentiment = filters.sentiment;
+    }
+    if (filters.acknowledged !== "all") {
+      params.acknowledged = filters.acknowledged === "acknowledged";
+    }
+    if (filters.tag) {
+      params.tag = filters.tag;
+    }
+    const dateFrom = dateRangeStart(filters.dateRange);
+    if (dateFrom) {
+      params.date_from = dateFrom;
+    }
+    return params;
+  }, [filters]);
+
+  // Totals and the tag list come from the server, not from the loaded pages
+  const fetchSummary = useCallback(async () => {
+    try {
+      const [dashboardResponse, tagsResponse] = await Promise.all([
+        axios.get(API_ENDPOINTS.FEEDBACK_DASHBOARD),
+        axios.get(`${API_ENDPOINTS.FEEDBACK}/tags/stats`),
+      ]);
+      const dashboard = dashboardResponse.data.dashboard;
+      const total =
+        user.role === "manager"
+          ? dashboard.total_feedback_given
+          : dashboard.total_feedback_received;
+      setSummary({
+        total,
+        acknowledged: dashboard.acknowledged_feedback,
+        unacknowledged: total - dashboard.acknowledged_feedback,
+        sentimentCounts: dashboard.sentiment_distribution,
+      });
+      setAllTags(tagsResponse.data.tags.map((tag) => tag.name));
+    } catch (error) {
+      console.error("Failed to fetch feedback summary:", error);
+    }
+  }, [user.role]);
+
+  // First page for the current filters
   const fetchFeedback = useCallback(async () => {
     try {
-      setLoading(true);
-      const response = await axios.get("/api/feedback/");
-      setFeedback(response.data.feedback);
+      const page = await fetchFeedbackPage(serverFilters);
+      setFeedback(page.feedback);
+      setNextCursor(page.nextCursor);
+      setSelectedItems([]);
       setError("");
     } catch (error) {
       console.error("Failed to fetch feedback:", error);
@@ -56,22 +128,35 @@ const FeedbackList = () => {
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [serverFilters]);
+
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await fetchFeedbackPage(serverFilters, nextCursor);
+      setFeedback((prev) => [...prev, ...page.feedback]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Failed to fetch feedback:", error);
+      toast.error("Failed to load more feedback");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   useEffect(() => {
     fetchFeedback();
   }, [fetchFeedback]);
 
+  useEffect(() => {
+    fetchSummary();
+  }, [fetchSummary]);
+
   const handleAcknowledge = async (feedbackId) => {
     try {
-      const response = await fetch(
-        getApiUrl(`/api/feedback/${feedbackId}/acknowledge`),
-        {
-          method: "POST",
-          headers: {
-            "X-User-ID": user.id.toString(),
-          },
-        }
+      const response = await authFetch(
+        `/api/feedback/${feedbackId}/acknowledge`,
+        { method: "POST" }
       );
 
       if (response.ok) {
@@ -80,6 +165,7 @@ const FeedbackList = () => {
             item.id === feedbackId ? { ...item, acknowledged: true } : item
           )
         );
+        fetchSummary();
         toast.success("Feedback acknowledged!");
       } else {
         const errorData = await response.json();
@@ -105,9 +191,8 @@ const FeedbackList = () => {
 
     try {
       const promises = unacknowledgedSelected.map((id) =>
-        fetch(getApiUrl(`/api/feedback/${id}/acknowledge`), {
+        authFetch(`/api/feedback/${id}/acknowledge`, {
           method: "POST",
-          headers: { "X-User-ID": user.id.toString() },
         })
       );
 
@@ -122,6 +207,7 @@ const FeedbackList = () => {
       );
 
       setSelectedItems([]);
+      fetchSummary();
       toast.success(
         `${unacknowledgedSelected.length} feedback items acknowledged!`
       );
@@ -132,13 +218,8 @@ const FeedbackList = () => {
 
   const handleExportPDF = async (feedbackId, employeeName, createdAt) => {
     try {
-      const response = await fetch(
-        getApiUrl(`/api/feedback/${feedbackId}/export-pdf`),
-        {
-          headers: {
-            "X-User-ID": user.id.toString(),
-          },
-        }
+      const response = await authFetch(
+        `/api/feedback/${feedbackId}/export-pdf`
       );
 
       if (response.ok) {
@@ -201,7 +282,7 @@ const FeedbackList = () => {
     }
   };
 
-  // Advanced filtering and sorting logic
+  // Search and sorting over the loaded pages
   const filteredFeedback = useMemo(() => {
     let filtered = [...feedback];
 
@@ -222,53 +303,6 @@ const FeedbackList = () => {
       );
     }
 
-    // Sentiment filter
-    if (filters.sentiment !== "all") {
-      filtered = filtered.filter(
-        (item) => item.sentiment === filters.sentiment
-      );
-    }
-
-    // Acknowledged filter
-    if (filters.acknowledged !== "all") {
-      const isAcknowledged = filters.acknowledged === "acknowledged";
-      filtered = filtered.filter(
-        (item) => item.acknowledged === isAcknowledged
-      );
-    }
-
-    // Date range filter
-    if (filters.dateRange !== "all") {
-      const now = new Date();
-      const filterDate = new Date();
-
-      switch (filters.dateRange) {
-        case "week":
-          filterDate.setDate(now.getDate() - 7);
-          break;
-        case "month":
-          filterDate.setMonth(now.getMonth() - 1);
-          break;
-        case "quarter":
-          filterDate.setMonth(now.getMonth() - 3);
-          break;
-        default:
-          // "all" case - no filtering needed
-          break;
-      }
-
-      filtered = filtered.filter(
-        (item) => new Date(item.created_at) >= filterDate
-      );
-    }
-
-    // Tags filter
-    if (filters.tags.length > 0) {
-      filtered = filtered.filter((item) =>
-        item.tags?.some((tag) => filters.tags.includes(tag))
-      );
-    }
-
     // Sorting
     filtered.sort((a, b) => {
       switch (sortBy) {
@@ -291,7 +325,7 @@ const FeedbackList = () => {
     });
 
     return filtered;
-  }, [feedback, searchTerm, filters, sortBy, user.role]);
+  }, [feedback, searchTerm, sortBy, user.role]);
 
   const getSentimentColor = (sentiment) => {
     switch (sentiment) {
@@ -342,30 +376,12 @@ const FeedbackList = () => {
     return `${Math.floor(diffInDays / 30)} months ago`;
   };
 
-  // Get unique tags for filter dropdown
-  const allTags = useMemo(() => {
-    const tags = new Set();
-    feedback.forEach((item) => {
-      item.tags?.forEach((tag) => tags.add(tag));
-    });
-    return Array.from(tags);
-  }, [feedback]);
-
-  const stats = useMemo(() => {
-    const total = feedback.length;
-    const acknowledged = feedback.filter((f) => f.acknowledged).length;
-    const sentimentCounts = feedback.reduce((acc, f) => {
-      acc[f.sentiment] = (acc[f.sentiment] || 0) + 1;
-      return acc;
-    }, {});
-
-    return {
-      total,
-      acknowledged,
-      unacknowledged: total - acknowledged,
-      sentimentCounts,
-    };
-  }, [feedback]);
+  const stats = summary || {
+    total: 0,
+    acknowledged: 0,
+    unacknowledged: 0,
+    sentimentCounts: {},
+  };
 
   if (loading) {
     return (
@@ -493,9 +509,7 @@ const FeedbackList = () => {
           >
             <FunnelIcon className="w-5 h-5 mr-2" />
             Filters
-            {Object.values(filters).some(
-              (f) => f !== "all" && (Array.isArray(f) ? f.length > 0 : true)
-            ) && (
+            {Object.keys(serverFilters).length > 0 && (
               <span className="ml-2 w-2 h-2 bg-primary-500 rounded-full"></span>
             )}
           </button>
@@ -621,20 +635,20 @@ const FeedbackList = () => {
               {allTags.length > 0 && (
                 <div className="mt-4">
                   <label className="block text-sm font-medium text-gray-700 mb-2">
-                    Filter by Tags
+                    Filter by Tag
                   </label>
                   <div className="flex flex-wrap gap-2">
                     {allTags.map((tag) => (
                       <button
                         key={tag}
-                        onClick={() => {
-                          const newTags = filters.tags.includes(tag)
-                            ? filters.tags.filter((t) => t !== tag)
-                            : [...filters.tags, tag];
-                          setFilters((prev) => ({ ...prev, tags: newTags }));
-                        }}
+                        onClick={() =>
+                          setFilters((prev) => ({
+                            ...prev,
+                            tag: prev.tag === tag ? "" : tag,
+                          }))
+                        }
                         className={`px-3 py-1 rounded-full text-sm font-medium transition-colors border ${
-                          filters.tags.includes(tag)
+                          filters.tag === tag
                             ? "bg-primary-100 text-primary-800 border-primary-300"
                             : "bg-gray-100 text-gray-700 border-gray-300 hover:bg-gray-200"
                         }`}
@@ -720,8 +734,8 @@ const FeedbackList = () => {
           </label>
 
           <div className="text-sm text-gray-500">
-            Showing {filteredFeedback.length} of {feedback.length} feedback
-            items
+            Showing {filteredFeedback.length} of {feedback.length} loaded
+            feedback items
           </div>
         </div>
       )}
@@ -745,17 +759,13 @@ const FeedbackList = () => {
           </div>
           <h3 className="text-lg font-medium text-gray-900 mb-2">
             {searchTerm ||
-            Object.values(filters).some(
-              (f) => f !== "all" && (Array.isArray(f) ? f.length > 0 : true)
-            )
+            Object.keys(serverFilters).length > 0
               ? "No feedback matches your criteria"
               : "No feedback yet"}
           </h3>
           <p className="text-gray-500">
             {searchTerm ||
-            Object.values(filters).some(
-              (f) => f !== "all" && (Array.isArray(f) ? f.length > 0 : true)
-            )
+            Object.keys(serverFilters).length > 0
               ? "Try adjusting your search or filters"
               : user.role === "manager"
               ? "Start giving feedback to your team members."
@@ -1160,6 +1170,19 @@ const FeedbackList = () => {
         </div>
       )}
 
+      {/* Next page */}
+      {nextCursor && (
+        <div className="flex justify-center mt-6">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="btn-secondary disabled:opacity-50"
+          >
+            {loadingMore ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
+
       {/* Comments Modal */}
       <AnimatePresence>
         {showComments && (
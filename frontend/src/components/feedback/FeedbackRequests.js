@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useCallback } from "react";
 import { useAuth } from "../../context/AuthContext";
-import { getApiUrl } from "../../config/api";
+import { authFetch } from "../../config/api";
 
 const FeedbackRequests = () => {
   const { user } = useAuth();
@@ -53,11 +53,10 @@ const FeedbackRequests = () => {
     setError("");
 
     try {
-      const response = await fetch(getApiUrl("/api/feedback/requests"), {
+      const response = await authFetch("/api/feedback/requests", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
-          "X-User-ID": user.id.toString(),
         },
         body: JSON.stringify({
           message: newRequestMessage,
@@ -82,13 +81,12 @@ const FeedbackRequests = () => {
 
   const handleUpdateRequestStatus = async (requestId, status) => {
     try {
-      const response = await fetch(
-        getApiUrl(`/api/feedback/requests/${requestId}`),
+      const response = await authFetch(
+        `/api/feedback/requests/${requestId}`,
         {
           method: "PUT",
           headers: {
             "Content-Type": "application/json",
-            "X-User-ID": user.id.toString(),
           },
           body: JSON.stringify({ status }),
         }
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from "react";
 import { useAuth } from "../../context/AuthContext";
 import { useNavigate } from "react-router-dom";
 import axios from "axios";
+import { API_ENDPOINTS } from "../../config/api";
 import {
   UserGroupIcon,
   CheckCircleIcon,
@@ -18,7 +19,12 @@ const TeamView = () => {
   const navigate = useNavigate();
 
   const [teamMembers, setTeamMembers] = useState([]);
-  const [feedback, setFeedback] = useState([]);
+  const [totals, setTotals] = useState({
+    total: 0,
+    acknowledged: 0,
+    pending: 0,
+  });
+  const [memberStats, setMemberStats] = useState({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
@@ -35,16 +41,30 @@ const TeamView = () => {
     }
   }, [isManager, isAuthenticated, navigate]);
 
+  // Team, totals and each member's latest feedback come from the manager dashboard
   const fetchTeamData = async () => {
     try {
       setLoading(true);
-      const [teamResponse, feedbackResponse] = await Promise.all([
-        axios.get("/api/users/team"),
-        axios.get("/api/feedback/"),
-      ]);
+      const response = await axios.get(API_ENDPOINTS.FEEDBACK_DASHBOARD, {
+        params: {
+          team_stats: true,
+          fields: "id,employee_id,sentiment,strengths,acknowledged,created_at",
+        },
+      });
+      const dashboard = response.data.dashboard;
 
-      setTeamMembers(teamResponse.data.team_members);
-      setFeedback(feedbackResponse.data.feedback);
+      setTeamMembers(dashboard.team_members);
+      setTotals({
+        total: dashboard.total_feedback_given,
+        acknowledged: dashboard.acknowledged_feedback,
+        pending: dashboard.pending_feedback,
+      });
+      setMemberStats(
+        dashboard.team_stats.reduce((acc, entry) => {
+          acc[entry.employee_id] = entry;
+          return acc;
+        }, {})
+      );
     } catch (error) {
       console.error("Failed to fetch team data:", error);
       setError("Failed to load team data");
@@ -53,35 +73,24 @@ const TeamView = () => {
     }
   };
 
-  const getTeamMemberFeedback = (memberId) => {
-    return feedback.filter((f) => f.employee_id === memberId);
-  };
-
-  const getLatestFeedback = (memberId) => {
-    const memberFeedback = getTeamMemberFeedback(memberId);
-    return memberFeedback.length > 0
-      ? memberFeedback[memberFeedback.length - 1]
-      : null;
-  };
-
   const getFeedbackStats = (memberId) => {
-    const memberFeedback = getTeamMemberFeedback(memberId);
-    const total = memberFeedback.length;
-    const acknowledged = memberFeedback.filter((f) => f.acknowledged).length;
-
-    const sentimentCounts = memberFeedback.reduce((acc, f) => {
-      acc[f.sentiment] = (acc[f.sentiment] || 0) + 1;
-      return acc;
-    }, {});
+    const entry = memberStats[memberId];
+    const total = entry ? entry.total : 0;
+    const acknowledged = entry ? entry.acknowledged : 0;
 
     return {
       total,
       acknowledged,
       unacknowledged: total - acknowledged,
-      sentimentCounts,
+      sentimentCounts: entry ? entry.sentiment : {},
     };
   };
 
+  const getLatestFeedback = (memberId) => {
+    const entry = memberStats[memberId];
+    return entry ? entry.latest_feedback : null;
+  };
+
   const formatDate = (dateString) => {
     return new Date(dateString).toLocaleDateString("en-US", {
       year: "numeric",
@@ -189,7 +198,7 @@ const TeamView = () => {
                   Total Feedback
                 </p>
                 <p className="text-2xl font-bold text-neutral-900">
-                  {feedback.length}
+                  {totals.total}
                 </p>
               </div>
             </div>
@@ -207,7 +216,7 @@ const TeamView = () => {
                   Acknowledged
                 </p>
                 <p className="text-2xl font-bold text-success-600">
-                  {feedback.filter((f) => f.acknowledged).length}
+                  {totals.acknowledged}
                 </p>
               </div>
             </div>
@@ -223,7 +232,7 @@ const TeamView = () => {
               <div className="min-w-0">
                 <p className="text-sm font-medium text-neutral-600">Pending</p>
                 <p className="text-2xl font-bold text-warning-600">
-                  {feedback.filter((f) => !f.acknowledged).length}
+                  {totals.pending}
                 </p>
               </div>
             </div>
@@ -1,3 +1,5 @@
+import axios from "axios";
+
 // API Configuration
 export const API_BASE_URL =
   process.env.REACT_APP_API_URL || "http://localhost:5000";
@@ -5,6 +7,8 @@ export const API_BASE_URL =
 export const API_ENDPOINTS = {
   // Auth endpoints
   LOGIN: "/api/auth/login",
+  LOGOUT: "/api/auth/logout",
+  REFRESH: "/api/auth/refresh",
   REGISTER: "/api/auth/register",
 
   // Feedback endpoints
@@ -25,3 +29,93 @@ export const buildApiUrl = (endpoint) => {
 export const getApiUrl = (path = "") => {
   return `${API_BASE_URL}${path}`;
 };
+
+// Login tokens: the access token is short-lived and renewed with the refresh token
+const TOKENS_KEY = "authTokens";
+
+export const getTokens = () => {
+  const savedTokens = localStorage.getItem(TOKENS_KEY);
+  return savedTokens ? JSON.parse(savedTokens) : null;
+};
+
+export const setTokens = (tokens) => {
+  localStorage.setItem(TOKENS_KEY, JSON.stringify(tokens));
+};
+
+export const clearSession = () => {
+  localStorage.removeItem(TOKENS_KEY);
+  localStorage.removeItem("currentUser");
+};
+
+export const authHeaders = () => {
+  const tokens = getTokens();
+  return tokens ? { Authorization: `Bearer ${tokens.access_token}` } : {};
+};
+
+// One refresh at a time, shared by every request that found its token expired
+let refreshing = null;
+
+// Resolves to the new access token, or null when the session cannot be renewed
+export const refreshAccessToken = () => {
+  if (!refreshing) {
+    const tokens = getTokens();
+    refreshing = (async () => {
+      if (!tokens?.refresh_token) {
+        return null;
+      }
+      const response = await fetch(getApiUrl(API_ENDPOINTS.REFRESH), {
+        method: "POST",
+        headers: { Authorization: `Bearer ${tokens.refresh_token}` },
+      });
+      if (!response.ok) {
+        return null;
+      }
+      const data = await response.json();
+      setTokens({ ...tokens, access_token: data.access_token });
+      localStorage.setItem("currentUser", JSON.stringify(data.user));
+      return data.access_token;
+    })()
+      .catch(() => null)
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+};
+
+export const endSession = () => {
+  clearSession();
+  window.location.assign("/login");
+};
+
+// The feedback listing is paged: one page per call, filtered by the server
+const FEEDBACK_PAGE_SIZE = 50;
+
+export const fetchFeedbackPage = async (filters = {}, cursor = null) => {
+  const response = await axios.get(`${API_ENDPOINTS.FEEDBACK}/`, {
+    params: { ...filters, limit: FEEDBACK_PAGE_SIZE, cursor: cursor || undefined },
+  });
+  return {
+    feedback: response.data.feedback,
+    nextCursor: response.data.next_cursor,
+  };
+};
+
+// fetch() with the access token, renewing it once on a 401
+export const authFetch = async (path, options = {}) => {
+  const send = () =>
+    fetch(getApiUrl(path), {
+      ...options,
+      headers: { ...options.headers, ...authHeaders() },
+    });
+
+  let response = await send();
+  if (response.status === 401) {
+    if (await refreshAccessToken()) {
+      response = await send();
+    } else {
+      endSession();
+    }
+  }
+  return response;
+};
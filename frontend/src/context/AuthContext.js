@@ -1,4 +1,11 @@
 import React, { createContext, useContext, useState } from "react";
+import axios from "axios";
+import {
+  API_ENDPOINTS,
+  clearSession,
+  getTokens,
+  setTokens,
+} from "../config/api";
 
 const AuthContext = createContext();
 
@@ -10,72 +17,37 @@ export const useAuth = () => {
   return context;
 };
 
-// Hardcoded users for simplicity
-const HARDCODED_USERS = {
-  "manager1@company.com": {
-    id: 1,
-    name: "John Manager",
-    email: "manager1@company.com",
-    role: "manager",
-    password: "password123",
-  },
-  "employee1@company.com": {
-    id: 2,
-    name: "Jane Employee",
-    email: "employee1@company.com",
-    role: "employee",
-    manager_id: 1,
-    password: "password123",
-  },
-  "employee2@company.com": {
-    id: 3,
-    name: "Bob Employee",
-    email: "employee2@company.com",
-    role: "employee",
-    manager_id: 1,
-    password: "password123",
-  },
-};
-
 export const AuthProvider = ({ children }) => {
   const [user, setUser] = useState(() => {
-    // Check if user is already logged in (from localStorage)
+    // Resume the session saved by login (only while its tokens are kept)
     const savedUser = localStorage.getItem("currentUser");
-    return savedUser ? JSON.parse(savedUser) : null;
+    return savedUser && getTokens() ? JSON.parse(savedUser) : null;
   });
 
   const login = async (email, password) => {
     try {
-      const foundUser = HARDCODED_USERS[email];
+      const response = await axios.post(API_ENDPOINTS.LOGIN, {
+        email,
+        password,
+      });
+      const { access_token, refresh_token, user: loggedInUser } = response.data;
 
-      if (foundUser && foundUser.password === password) {
-        const userWithoutPassword = { ...foundUser };
-        delete userWithoutPassword.password;
+      setTokens({ access_token, refresh_token });
+      localStorage.setItem("currentUser", JSON.stringify(loggedInUser));
+      setUser(loggedInUser);
 
-        setUser(userWithoutPassword);
-        localStorage.setItem(
-          "currentUser",
-          JSON.stringify(userWithoutPassword)
-        );
-
-        return { success: true };
-      } else {
-        return {
-          success: false,
-          error: "Invalid credentials",
-        };
-      }
+      return { success: true };
     } catch (error) {
       console.error("Login failed:", error);
       return {
         success: false,
-        error: "Login failed",
+        error: error.response?.data?.error || "Login failed",
       };
     }
   };
 
   const register = async (userData) => {
-    // For now, registration is not implemented in hardcoded mode
+    // Accounts are created by administrators (see `flask seed` for the demo users)
     return {
       success: false,
       error: "Registration not available in demo mode",
@@ -83,8 +55,19 @@ export const AuthProvider = ({ children }) => {
   };
 
   const logout = () => {
+    // End the local session right away, then revoke both tokens server-side
+    const tokens = getTokens();
+    clearSession();
     setUser(null);
-    localStorage.removeItem("currentUser");
+    if (tokens) {
+      axios
+        .post(
+          API_ENDPOINTS.LOGOUT,
+          { refresh_token: tokens.refresh_token },
+          { headers: { Authorization: `Bearer ${tokens.access_token}` } }
+        )
+        .catch((error) => console.error("Logout failed:", error));
+    }
   };
 
   const value = {
@@ -92,7 +75,7 @@ export const AuthProvider = ({ children }) => {
     login,
     register,
     logout,
-    loading: false, // No loading state needed for hardcoded auth
+    loading: false, // The session is restored synchronously from localStorage
     isAuthenticated: !!user,
     isManager: user?.role === "manager",
     isEmployee: user?.role === "employee",
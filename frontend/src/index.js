@@ -3,21 +3,17 @@ import ReactDOM from "react-dom/client";
 import "./index.css";
 import App from "./App";
 import axios from "axios";
+import { authHeaders, endSession, refreshAccessToken } from "./config/api";
 
 // Configure axios to use Flask backend
 const API_URL = process.env.REACT_APP_API_URL || "http://localhost:5000";
 axios.defaults.baseURL = API_URL;
 axios.defaults.headers.common["Content-Type"] = "application/json";
 
-// Add request interceptor to include user ID in headers for hardcoded auth
+// Send the access token from the login with every request
 axios.interceptors.request.use(
   (config) => {
-    // Get current user from localStorage
-    const currentUser = localStorage.getItem("currentUser");
-    if (currentUser) {
-      const user = JSON.parse(currentUser);
-      config.headers["X-User-ID"] = user.id;
-    }
+    Object.assign(config.headers, authHeaders());
     return config;
   },
   (error) => {
@@ -25,6 +21,28 @@ axios.interceptors.request.use(
   }
 );
 
+// On 401 renew the access token once and retry; back to login if that fails
+axios.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const { config, response } = error;
+    if (
+      response?.status !== 401 ||
+      !config ||
+      config._retried ||
+      config.url?.startsWith("/api/auth/")
+    ) {
+      return Promise.reject(error);
+    }
+    if (!(await refreshAccessToken())) {
+      endSession();
+      return Promise.reject(error);
+    }
+    config._retried = true;
+    return axios(config);
+  }
+);
+
 const root = ReactDOM.createRoot(document.getElementById("root"));
 root.render(
   <React.StrictMode>